@@ -0,0 +1,88 @@
+import argparse
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+# modules a simulation needs, whatever its input and output files
+CORE_MODULES = [
+    'sit_simulation.core.simulation',
+    'sit_simulation.engines.engine_factory',
+    'sit_simulation.observers.count_recorder',
+    'sit_simulation.core.batch_runner',
+    'sit_simulation.__main__',
+]
+
+# dependencies only the code paths using them may import
+HEAVY_MODULES = ['pandas', 'matplotlib', 'tqdm', 'yaml', 'pyarrow', 'zarr']
+
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime``.
+
+    :return: cumulative import time in microseconds of every module imported
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True
+    )
+    return {
+        match.group(4): int(match.group(2))
+        for match in IMPORT_TIME.finditer(result.stderr)
+    }
+
+
+def check_module(module: str, budget: float, repeat: int) -> List[str]:
+    """:return: the violations of the import budget by ``module``"""
+    runs = [import_times(module) for _ in range(repeat)]
+    milliseconds = min(times[module] for times in runs) / 1000
+    heavy = sorted(
+        name for name in runs[0]
+        if name.split('.')[0] in HEAVY_MODULES and '.' not in name
+    )
+
+    print(f"{module}: {milliseconds:.1f} ms" + (f", imports {', '.join(heavy)}" if heavy else ""))
+
+    errors = []
+    if heavy:
+        errors.append(f"{module} imports {', '.join(heavy)}")
+    if milliseconds > budget:
+        errors.append(f"{module} takes {milliseconds:.1f} ms to import, budget is {budget} ms")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that the core modules import fast and without heavy dependencies"
+    )
+
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=400,
+        help="Maximal cumulative import time of each core module, in milliseconds"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Imports of each module, the fastest one being kept"
+    )
+
+    args = parser.parse_args()
+
+    errors = []
+    for module in CORE_MODULES:
+        errors.extend(check_module(module, args.budget, args.repeat))
+
+    for error in errors:
+        print(f"FAIL: {error}", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,35 +1,109 @@
 import argparse
+import json
 import os
-
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
+from tqdm import tqdm
 
 from sit_simulation.core.config import SimulationConfig
-from sit_simulation.core.constants import StateNames
+from sit_simulation.core.constants import OutputFormats, STATE_CODES, StateNames
+from sit_simulation.outputs.output_factory import OutputFactory
+
+# features of each patch: the wild states in alphabetical order, then the
+# sterile males
+FEATURE_STATES = sorted(
+    [s for s in StateNames if s not in (StateNames.SM, StateNames.DEAD)],
+    key=lambda s: s.value
+) + [StateNames.SM]
+
+# release of this day is the one repeated over the future window
+RELEASE_DAY = 76
+
+OUTPUT_DTYPES = {'past': np.int64, 'future': np.int64, 'release_strategy': np.float64}
+OUTPUT_ARRAYS = tuple(OUTPUT_DTYPES)
+
+
+class SimulationSource:
+    """
+    Simulations of an input folder: either one sub-folder of patch CSV files
+    and release strategy per simulation, or the batch store and
+    release_strategies.npy written by multiple_simulation.py. Simulations are
+    loaded one at a time.
+    """
+
+    def __init__(self, path: Path, numbers_of_patches: int) -> None:
+        self.path = path
+        self.numbers_of_patches = numbers_of_patches
+
+        self.store_format = None
+        for output_format, filename in (
+                (OutputFormats.NPZ, 'counts.npy'),
+                (OutputFormats.ZARR, 'counts.zarr'),
+        ):
+            if (path / filename).exists():
+                self.store_format = output_format
+
+        if self.store_format is not None:
+            _, metadata = OutputFactory.create_output(self.store_format).open_store(path)
+            self.names = [str(r) for r in metadata['replicates']]
+        else:
+            self.names = sorted(
+                next(os.walk(path))[1],
+                key=lambda name: (not name.isdigit(), int(name) if name.isdigit() else 0, name)
+            )
+
+        self._store = None
+        self._release_strategies = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def load(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: (days + 1, patches, states) counts and release strategy
+            rows (day, release of each patch) of a simulation
+        """
+        if self.store_format is None:
+            return self._load_folder(self.path / self.names[index])
+
+        if self._store is None:
+            self._store, _ = OutputFactory.create_output(self.store_format).open_store(self.path)
+            self._release_strategies = np.load(
+                self.path / 'release_strategies.npy', mmap_mode='r'
+            )
+        return np.asarray(self._store[index]), np.asarray(self._release_strategies[index])
+
+    def _load_folder(self, folder: Path) -> Tuple[np.ndarray, np.ndarray]:
+        patches = [
+            pd.read_csv(folder / f'patch_{patch}.csv')
+            for patch in range(self.numbers_of_patches)
+        ]
+        counts = np.zeros((len(patches[0]), self.numbers_of_patches, len(StateNames)), dtype=np.int64)
+        for patch, df in enumerate(patches):
+            for state in StateNames:
+                if state.value in df.columns:
+                    counts[:, patch, STATE_CODES[state]] = df[state.value]
+
+        release_strategy = pd.read_csv(folder / 'release_strategy.csv')[
+            ['day'] + [str(x) for x in range(self.numbers_of_patches)]
+        ]
+        return counts, release_strategy.values
 
 
 def process_simulation(
-        data_simulation: List[pd.DataFrame],
-        release_strategy: pd.DataFrame,
+        counts: np.ndarray,
+        release_strategy: np.ndarray,
         past_len: int,
         future_len: int,
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-    data_simulation = [
-        df[
-            sorted([col for col in df.columns if col != StateNames.SM])
-            + [StateNames.SM]
-        ].drop(columns=['Day']).values
-        for df in data_simulation
-    ]
-    simulation = np.concatenate(data_simulation, axis=1)
-
-    strat = np.zeros((future_len, len(release_strategy.columns) - 1))
+    simulation = counts[:, :, [STATE_CODES[s] for s in FEATURE_STATES]].reshape(len(counts), -1)
 
-    for i in range(strat.shape[0]):
-        strat[i, :] = release_strategy[release_strategy['day']==76].values[0, 1:]
+    strat = np.zeros((future_len, release_strategy.shape[1] - 1))
+    strat[:] = release_strategy[release_strategy[:, 0] == RELEASE_DAY][0, 1:]
 
     return (
         simulation[:past_len, :],
@@ -37,33 +111,131 @@ def process_simulation(
         strat
     )
 
+
+def open_dataset(
+        output_path: Path,
+        source: SimulationSource,
+        past_len: int,
+        future_len: int,
+        resume: bool
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Create the memory-mapped outputs, or reopen them when resuming a build
+    of the same simulations.
+
+    :return: output arrays by name, and the mask of simulations already done
+    """
+    description = {
+        'simulations': source.names,
+        'past_len': past_len,
+        'future_len': future_len,
+    }
+    shapes = {
+        'past': (len(source), past_len, source.numbers_of_patches * len(FEATURE_STATES)),
+        'future': (len(source), future_len, source.numbers_of_patches * len(FEATURE_STATES)),
+        'release_strategy': (len(source), future_len, source.numbers_of_patches),
+    }
+
+    if resume and (output_path / 'dataset.json').exists():
+        with open(output_path / 'dataset.json') as file:
+            if json.load(file) != description:
+                raise ValueError(
+                    f"{output_path} holds a dataset of other simulations or lengths, "
+                    f"it cannot be resumed"
+                )
+        mode = 'r+'
+    else:
+        os.makedirs(output_path, exist_ok=True)
+        with open(output_path / 'dataset.json', 'w') as file:
+            json.dump(description, file)
+        mode = 'w+'
+
+    arrays = {
+        name: np.lib.format.open_memmap(
+            output_path / f'{name}.npy', mode=mode, dtype=OUTPUT_DTYPES[name], shape=shape
+        )
+        for name, shape in shapes.items()
+    }
+    done = np.lib.format.open_memmap(
+        output_path / 'done.npy', mode=mode, dtype=bool, shape=(len(source),)
+    )
+    return arrays, done
+
+
 def process_dataset(
         dataset_path: Path,
+        output_path: Path,
         simulation_config: SimulationConfig,
         past_len: int,
+        future_len: int,
+        processes: int = None,
+        chunk_size: int = 16,
+        resume: bool = False
+) -> None:
+    """
+    Write past.npy, future.npy and release_strategy.npy in ``output_path``,
+    one simulation at a time. done.npy marks the simulations written so far,
+    so that an interrupted build is completed with ``resume``.
+    """
+    source = SimulationSource(dataset_path, simulation_config.numbers_of_patches)
+    arrays, done = open_dataset(output_path, source, past_len, future_len, resume)
+    todo = np.flatnonzero(~done).tolist()
+    del arrays
+
+    worker_args = (source, output_path, past_len, future_len)
+    progress = tqdm(total=len(source), initial=len(source) - len(todo))
+
+    if processes == 1:
+        _init_worker(*worker_args)
+        results = map(_process_simulation, todo)
+        _mark_done(results, done, progress, chunk_size)
+    else:
+        with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=worker_args
+        ) as executor:
+            results = executor.map(_process_simulation, todo, chunksize=chunk_size)
+            _mark_done(results, done, progress, chunk_size)
+
+    progress.close()
+    done.flush()
+
+
+def _mark_done(results, done: np.ndarray, progress: tqdm, chunk_size: int) -> None:
+    for count, index in enumerate(results, 1):
+        done[index] = True
+        progress.update()
+        if count % chunk_size == 0:
+            done.flush()
+
+
+_source: SimulationSource = None
+_arrays: Dict[str, np.ndarray] = {}
+_lengths: Tuple[int, int] = (0, 0)
+
+
+def _init_worker(
+        source: SimulationSource,
+        output_path: Path,
+        past_len: int,
         future_len: int
-) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-    dataset = [
-        [
-            [
-                pd.read_csv(dataset_path / dir_name / f'patch_{patch}.csv')
-                for patch in range(simulation_config.numbers_of_patches)
-            ],
-            pd.read_csv(dataset_path / dir_name / 'release_strategy.csv')[['day']+[str(x) for x in range(simulation_config.numbers_of_patches)]]
-        ]
-        for dir_name in next(os.walk(dataset_path))[1]
-    ]
+) -> None:
+    global _source, _arrays, _lengths
+    _source = source
+    _arrays = {
+        name: np.load(output_path / f'{name}.npy', mmap_mode='r+')
+        for name in OUTPUT_ARRAYS
+    }
+    _lengths = (past_len, future_len)
 
-    past_list, future_list, release_strategy_list = zip(*[
-        process_simulation(*(simulation + [past_len, future_len]))
-        for simulation in dataset
-    ])
 
-    return (
-        np.array(past_list),
-        np.array(future_list),
-        np.array(release_strategy_list),
-    )
+def _process_simulation(index: int) -> int:
+    outputs = process_simulation(*_source.load(index), *_lengths)
+    for name, output in zip(OUTPUT_ARRAYS, outputs):
+        _arrays[name][index] = output
+    return index
+
 
 def main():
     parser = argparse.ArgumentParser(description="SIT Multi-Agent Simulation")
@@ -106,23 +278,40 @@ def main():
         help="Future length of simulation"
     )
 
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Worker processes, one per CPU by default"
+    )
+
+    parser.add_argument(
+        "--chunk_size",
+        type=int,
+        default=16,
+        help="Simulations sent to a worker at a time"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Complete a partial build of the same dataset in --output"
+    )
 
     args = parser.parse_args()
 
     simulation_config = SimulationConfig.load_from_file(args.simu_config)
 
-    past, future, release_strategy = process_dataset(
+    process_dataset(
         Path(args.input),
+        Path(args.output),
         simulation_config,
         past_len=args.past_len,
         future_len=args.future_len,
+        processes=args.processes,
+        chunk_size=args.chunk_size,
+        resume=args.resume,
     )
 
-    os.makedirs(Path(args.output), exist_ok=True)
-
-    np.save(Path(args.output) / 'past.npy', past)
-    np.save(Path(args.output) / 'future.npy', future)
-    np.save(Path(args.output) / 'release_strategy.npy', release_strategy)
-
 if __name__ == "__main__":
     main()
@@ -1,44 +1,39 @@
 import argparse
 import functools
 import os
-import random
-from typing import List
 
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
-from tqdm.contrib.concurrent import process_map
 
-from sit_simulation.__main__ import main as sit_main
-from sit_simulation.core.config import SimulationConfig
+from sit_simulation.core.batch_runner import BatchRunner
+from sit_simulation.core.config import InsectConfig, SimulationConfig
+from sit_simulation.core.constants import EngineTypes, OutputFormats
+from sit_simulation.core.random_streams import RandomStreams
+from sit_simulation.core.release_strategy import ReleaseStrategy
 
 
-def get_sit_args(base_config: str, output: str, release_strategy) -> List[str]:
-    return [
-        '--simu_config', base_config + '/simulation_config.yaml',
-        '--insect_config',  base_config + '/insect_config.yaml',
-        '--initial_insects', base_config + '/initial_insects.csv',
-        '--release_strategy', release_strategy,
-        '--output', output # <-- New output
-    ]
-
-
-def generate_release_strategy(output: str, simulation_config: SimulationConfig):
-    df = pd.DataFrame(columns=['day']+list(range(simulation_config.numbers_of_patches)))
-    a, b = random.uniform(0, 100000), random.uniform(0, 100000)
+def generate_release_strategy(
+        simulation_config: SimulationConfig,
+        rng: np.random.Generator
+) -> pd.DataFrame:
+    df = pd.DataFrame(
+        columns=['day'] + [str(x) for x in range(simulation_config.numbers_of_patches)]
+    )
+    a, b = rng.uniform(0, 100000), rng.uniform(0, 100000)
     for day in range(20, simulation_config.numbers_of_day, 7):
         df.loc[len(df), :] = [day, a, b]
-    df.to_csv(output)
+    return df
+
+
+def replicate_release_strategy(
+        replicate: int,
+        simulation_config: SimulationConfig,
+        seed: int
+) -> ReleaseStrategy:
+    return ReleaseStrategy(generate_release_strategy(
+        simulation_config, RandomStreams(seed, replicate).release_strategy
+    ))
 
-def run_sit(number, args, simulation_config: SimulationConfig):
-    output = f'{args.output}/{number}'
-    os.makedirs(output)
-    generate_release_strategy(f'{output}/release_strategy.csv', simulation_config)
-    sit_args = get_sit_args(
-        base_config=args.base_config,
-        output=output,
-        release_strategy=f'{output}/release_strategy.csv'
-    )
-    sit_main(sit_args, tqdm_disable=True)
 
 def main():
     parser = argparse.ArgumentParser(description="Execute Multiple SIT Simulation")
@@ -64,27 +59,125 @@ def main():
         help="Number of simulations"
     )
 
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Root seed, replicate i runs with the streams of (seed, i)"
+    )
+
+    parser.add_argument(
+        "--engine",
+        type=EngineTypes,
+        choices=list(EngineTypes),
+        default=EngineTypes.OBJECT,
+        help="Population engine of every replicate"
+    )
+
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Worker processes, one per CPU by default"
+    )
+
+    parser.add_argument(
+        "--chunk_size",
+        type=int,
+        default=1,
+        help="Replicates sent to a worker at a time"
+    )
+
+    parser.add_argument(
+        "--burn_in",
+        type=int,
+        default=0,
+        help="First days simulated once and shared by every simulation, at "
+             "most 19 since the releases start on day 20"
+    )
+
+    parser.add_argument(
+        "--ensemble_size",
+        type=int,
+        default=1,
+        help="Simulations advanced together in one run, each in its own copy "
+             "of the landscape; best with the vectorized or cohort engine, and "
+             "their results depend on this size"
+    )
+
+    parser.add_argument(
+        "--csv",
+        action="store_true",
+        help="Also write one folder of patch CSV files and release strategy "
+             "per replicate, as read by data_processing.py"
+    )
+
+    parser.add_argument(
+        "--plots",
+        action="store_true",
+        help="Also render the PDF report of each replicate (implies --csv)"
+    )
+
+    parser.add_argument(
+        "--output_format",
+        type=OutputFormats,
+        choices=[OutputFormats.NPZ, OutputFormats.ZARR],
+        default=OutputFormats.NPZ,
+        help="Format of the single store receiving the counts of every simulation"
+    )
+
     args = parser.parse_args()
 
+    if args.seed is None:
+        args.seed = np.random.SeedSequence().entropy
+
     os.makedirs(f'{args.output}')
 
     simulation_config = SimulationConfig.load_from_file(
         f'{args.base_config}/simulation_config.yaml'
     )
+    write_csv = args.csv or args.plots
+
+    batch_runner = BatchRunner(
+        insect_config=InsectConfig.load_from_file(
+            f'{args.base_config}/insect_config.yaml'
+        ),
+        simulation_config=simulation_config,
+        initial_insects=pd.read_csv(f'{args.base_config}/initial_insects.csv'),
+        release_strategy=functools.partial(
+            replicate_release_strategy,
+            simulation_config=simulation_config,
+            seed=args.seed
+        ),
+        engine_type=args.engine,
+        seed=args.seed,
+        workers=args.processes,
+        chunk_size=args.chunk_size,
+        output=args.output if write_csv else None,
+        plots=args.plots,
+        burn_in=args.burn_in,
+        ensemble_size=args.ensemble_size,
+    )
 
-    run_sit_partial = functools.partial(
-        run_sit,
-        args=args,
-        simulation_config=simulation_config
+    replicates = range(args.number_of_simulations)
+    batch_runner.run_to_store(
+        args.output, replicates, args.output_format, tqdm_disable=False
     )
 
-    results = process_map(
-        run_sit_partial,
-        range(0, args.number_of_simulations),
-        max_workers=10
+    release_strategies = [
+        generate_release_strategy(
+            simulation_config, RandomStreams(args.seed, replicate).release_strategy
+        )
+        for replicate in replicates
+    ]
+    np.save(
+        f'{args.output}/release_strategies.npy',
+        np.array([df.values for df in release_strategies], dtype=np.float64)
     )
+    if write_csv:
+        for replicate, df in zip(replicates, release_strategies):
+            df.to_csv(f'{args.output}/{replicate}/release_strategy.csv')
 
 
 if __name__ == '__main__':
     main()
-
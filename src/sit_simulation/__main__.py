@@ -1,23 +1,38 @@
 import argparse
+import os
 from typing import List
 
 from sit_simulation.core.config import SimulationConfig, InsectConfig
+from sit_simulation.core.constants import EngineTypes, OutputFormats
 from sit_simulation.core.initial_insects import InitialInsects
 from sit_simulation.core.release_strategy import ReleaseStrategy
 from sit_simulation.core.simulation import Simulation
 from sit_simulation.core.spatial_manager import SpatialManager
+from sit_simulation.engines.engine_factory import EngineFactory
 from sit_simulation.observers.data_collector import DataCollector
 from sit_simulation.observers.logger import Logger
+from sit_simulation.observers.profiling_observer import ProfilingObserver
+from sit_simulation.observers.report_observer import ReportObserver
 
+# formats of the single store written by batch
+BATCH_OUTPUT_FORMATS = [OutputFormats.NPZ, OutputFormats.ZARR]
 
-def main(cli_args: List[str] = None, tqdm_disable: bool = False) -> None:
-    parser = argparse.ArgumentParser(description="SIT Multi-Agent Simulation")
+
+def add_simulation_arguments(parser: argparse.ArgumentParser, defaults: bool = True) -> None:
+    """
+    Arguments shared by a single run and a batch of replicates.
+
+    :param defaults: False for the batch subcommand, whose arguments only
+        override the ones given before it when present
+    """
+    def default(value):
+        return value if defaults else argparse.SUPPRESS
 
     parser.add_argument(
         "--simu_config",
         "-sc",
         type=str,
-        default="config/simulation_config.yaml",
+        default=default("config/simulation_config.yaml"),
         help="Simulation configuration file path"
     )
 
@@ -25,7 +40,7 @@ def main(cli_args: List[str] = None, tqdm_disable: bool = False) -> None:
         "--insect_config",
         "-ic",
         type=str,
-        default="config/insect_config.yaml",
+        default=default("config/insect_config.yaml"),
         help="Insect configuration file path"
     )
 
@@ -33,7 +48,7 @@ def main(cli_args: List[str] = None, tqdm_disable: bool = False) -> None:
         "--initial_insects",
         "-ii",
         type=str,
-        default="config/initial_insects.csv",
+        default=default("config/initial_insects.csv"),
         help="Path to initial insect folders"
     )
 
@@ -41,7 +56,7 @@ def main(cli_args: List[str] = None, tqdm_disable: bool = False) -> None:
         "--release_strategy",
         "-rs",
         type=str,
-        default="config/release_strategy.csv",
+        default=default("config/release_strategy.csv"),
         help="Release strategy file path"
     )
 
@@ -49,17 +64,262 @@ def main(cli_args: List[str] = None, tqdm_disable: bool = False) -> None:
         "--output",
         "-o",
         type=str,
-        default="output",
+        default=default("output"),
         help="Path to output file"
     )
 
+    parser.add_argument(
+        "--engine",
+        "-e",
+        type=EngineTypes,
+        choices=list(EngineTypes),
+        default=default(EngineTypes.OBJECT),
+        help="Population engine: object (one object per insect), vectorized "
+             "(NumPy columns), cohort (cohorts), sharded (NumPy columns sharded "
+             "by patch across processes), mean_field (deterministic expected "
+             "counts), hybrid (cohorts turning into individual insects when few) "
+             "or keyed (NumPy columns drawing from per-insect random streams)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default(None),
+        help="Processes used by the sharded engine, one per CPU by default"
+    )
+
+    parser.add_argument(
+        "--agent_threshold",
+        type=int,
+        default=default(None),
+        help="Insects of a patch and state below which the hybrid engine "
+             "simulates them individually, 100 by default"
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=default(None),
+        help="Seed of the random streams, fresh entropy if not given"
+    )
+
+
+def main(cli_args: List[str] = None, tqdm_disable: bool = False) -> None:
+    parser = argparse.ArgumentParser(description="SIT Multi-Agent Simulation")
+    add_simulation_arguments(parser)
+
+    parser.add_argument(
+        "--replicate",
+        type=int,
+        default=None,
+        help="Index of the replicate of --seed to run"
+    )
+
+    parser.add_argument(
+        "--output_format",
+        type=OutputFormats,
+        choices=list(OutputFormats),
+        default=None,
+        help="File format of the counts written in --output, csv by default "
+             "(npz for batch)"
+    )
+
+    parser.add_argument(
+        "--plots",
+        action="store_true",
+        help="Also render the PDF report of the run in --output"
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Also write the time spent in each phase of each day to "
+             "profile.csv in --output"
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="File receiving a checkpoint of the run every --checkpoint_interval days"
+    )
+
+    parser.add_argument(
+        "--checkpoint_interval",
+        type=int,
+        default=10,
+        help="Days between two checkpoints"
+    )
+
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        help="Checkpoint to resume the run from; the other simulation "
+             "arguments are ignored"
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    batch_parser = subparsers.add_parser(
+        "batch",
+        description="Run replicates of one setup in a pool of processes",
+        help="Run replicates of one setup in a pool of processes"
+    )
+    add_simulation_arguments(batch_parser, defaults=False)
+
+    batch_parser.add_argument(
+        "--replicates",
+        "-n",
+        type=int,
+        default=10,
+        help="Number of replicates, run with the streams of (seed, 0..n-1)"
+    )
+
+    batch_parser.add_argument(
+        "--processes",
+        "-p",
+        type=int,
+        default=None,
+        help="Worker processes, one per CPU by default"
+    )
+
+    batch_parser.add_argument(
+        "--chunk_size",
+        type=int,
+        default=1,
+        help="Replicates sent to a worker at a time"
+    )
+
+    batch_parser.add_argument(
+        "--burn_in",
+        type=int,
+        default=0,
+        help="First days simulated once and shared by every replicate, "
+             "which then continues with its own streams"
+    )
+
+    batch_parser.add_argument(
+        "--ensemble_size",
+        type=int,
+        default=1,
+        help="Replicates advanced together in one simulation, each in its own "
+             "copy of the landscape; their results depend on this size"
+    )
+
+    batch_parser.add_argument(
+        "--paired_release_strategy",
+        type=str,
+        default=None,
+        help="Also run every replicate under this release strategy, with the "
+             "same streams, and write the statistics of the differences to "
+             "<output>/paired.json instead of storing the counts; best with "
+             "--engine keyed"
+    )
+
+    batch_parser.add_argument(
+        "--csv",
+        action="store_true",
+        help="Also write the patch CSV files of replicate i in <output>/i"
+    )
+
+    batch_parser.add_argument(
+        "--plots",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="Also render the PDF report of each replicate (implies --csv)"
+    )
+
+    batch_parser.add_argument(
+        "--output_format",
+        type=OutputFormats,
+        choices=BATCH_OUTPUT_FORMATS,
+        default=argparse.SUPPRESS,
+        help="Format of the single store receiving the counts of every "
+             "replicate, npz by default"
+    )
+
+    report_parser = subparsers.add_parser(
+        "report",
+        description="Render the PDF reports of stored runs",
+        help="Render the PDF reports of stored runs"
+    )
+
+    report_parser.add_argument(
+        "runs",
+        nargs="+",
+        help="Output folders of the runs, or of batch stores with --store"
+    )
+
+    report_parser.add_argument(
+        "--output_format",
+        type=OutputFormats,
+        choices=list(OutputFormats),
+        default=argparse.SUPPRESS,
+        help="Format in which the runs were written, csv by default"
+    )
+
+    report_parser.add_argument(
+        "--store",
+        action="store_true",
+        help="The folders hold batch stores: render the report of each "
+             "replicate in <folder>/reports/<replicate>"
+    )
+
+    report_parser.add_argument(
+        "--processes",
+        "-p",
+        type=int,
+        default=None,
+        help="Worker processes, one per CPU by default"
+    )
+
     args = parser.parse_args(cli_args)
 
+    if args.command == "batch" and args.output_format not in (None, *BATCH_OUTPUT_FORMATS):
+        parser.error(
+            f"argument --output_format: batch stores are written as "
+            f"{' or '.join(BATCH_OUTPUT_FORMATS)}, not {args.output_format}"
+        )
+    if args.engine == EngineTypes.SHARDED and (args.checkpoint or args.resume):
+        parser.error("argument --checkpoint/--resume: the sharded engine cannot be checkpointed")
+
+    if args.command == "batch":
+        run_batch(args, tqdm_disable)
+        return
+    if args.command == "report":
+        run_report(args, tqdm_disable)
+        return
+
+    if args.resume is not None:
+        simulation = Simulation.restore(args.resume)
+    else:
+        simulation = create_simulation(args)
+
+    if args.checkpoint is None:
+        simulation.run(tqdm_disable)
+        return
+
+    numbers_of_day = simulation.simulation_config.numbers_of_day
+    while simulation.current_day < numbers_of_day:
+        simulation.run(tqdm_disable, until_day=simulation.current_day + args.checkpoint_interval)
+        if simulation.current_day < numbers_of_day:
+            simulation.checkpoint(args.checkpoint)
+
+
+def create_simulation(args: argparse.Namespace) -> Simulation:
+    """The single run described by the command line arguments."""
     insect_config = InsectConfig.load_from_file(args.insect_config)
     simulation_config = SimulationConfig.load_from_file(args.simu_config)
     release_strategy = ReleaseStrategy.load_from_file(args.release_strategy)
     spatial_manager = SpatialManager(insect_config, simulation_config)
-    data_collector = DataCollector(args.output)
+    data_collector = DataCollector(
+        args.output, output_format=args.output_format or OutputFormats.CSV
+    )
+    observers = [data_collector, ]
+    if args.plots:
+        observers.append(ReportObserver(args.output, data_collector))
+    if args.profile:
+        observers.append(ProfilingObserver(args.output))
     logger = Logger()
 
     initial_insects = InitialInsects.load_from_file(
@@ -68,16 +328,89 @@ def main(cli_args: List[str] = None, tqdm_disable: bool = False) -> None:
         insect_config=insect_config,
     )
 
-    simulation = Simulation(
+    return Simulation(
         insect_config=insect_config,
         simulation_config=simulation_config,
         release_strategy=release_strategy,
         spatial_manager=spatial_manager,
-        initial_insects=initial_insects.initial_insects_list(),
-        observers=[data_collector, ],
+        initial_insects=initial_insects,
+        observers=observers,
+        engine=EngineFactory.create_engine(args.engine, args.workers, args.agent_threshold),
+        seed=args.seed,
+        replicate=args.replicate,
+    )
+
+
+def run_batch(args: argparse.Namespace, tqdm_disable: bool = False) -> None:
+    """Run ``args.replicates`` replicates and store their counts in --output."""
+    import pandas as pd
+
+    from sit_simulation.core.batch_runner import BatchRunner
+
+    batch_runner = BatchRunner(
+        insect_config=InsectConfig.load_from_file(args.insect_config),
+        simulation_config=SimulationConfig.load_from_file(args.simu_config),
+        initial_insects=pd.read_csv(args.initial_insects),
+        release_strategy=ReleaseStrategy.load_from_file(args.release_strategy),
+        engine_type=args.engine,
+        seed=args.seed,
+        workers=args.processes,
+        chunk_size=args.chunk_size,
+        output=args.output if args.csv or args.plots else None,
+        plots=args.plots,
+        burn_in=args.burn_in,
+        agent_threshold=args.agent_threshold,
+        ensemble_size=args.ensemble_size,
+    )
+
+    if args.paired_release_strategy is not None:
+        import json
+
+        counts_a, counts_b = batch_runner.run_paired(
+            ReleaseStrategy.load_from_file(args.paired_release_strategy),
+            range(args.replicates),
+            tqdm_disable
+        )
+        statistics = BatchRunner.paired_statistics(counts_a, counts_b)
+        os.makedirs(args.output, exist_ok=True)
+        with open(os.path.join(args.output, 'paired.json'), 'w') as file:
+            json.dump(statistics, file, indent=2)
+        return
+
+    batch_runner.run_to_store(
+        args.output,
+        range(args.replicates),
+        args.output_format or OutputFormats.NPZ,
+        tqdm_disable
     )
 
-    simulation.run(tqdm_disable)
+
+def run_report(args: argparse.Namespace, tqdm_disable: bool = False) -> None:
+    """Render the reports of ``args.runs`` in a pool of processes."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from tqdm import tqdm
+
+    from sit_simulation.outputs.output_factory import OutputFactory
+    from sit_simulation.outputs.pdf_report import render_stored_run
+
+    output_format = args.output_format or OutputFormats.CSV
+    jobs = []
+    for path in args.runs:
+        if not args.store:
+            jobs.append((path, output_format, path, None))
+            continue
+
+        _, metadata = OutputFactory.create_output(output_format).open_store(path)
+        jobs.extend(
+            (path, output_format, os.path.join(path, "reports", str(replicate)), index)
+            for index, replicate in enumerate(metadata['replicates'])
+        )
+
+    with ProcessPoolExecutor(max_workers=args.processes) as executor:
+        reports = executor.map(render_stored_run, *zip(*jobs))
+        for _ in tqdm(reports, total=len(jobs), disable=tqdm_disable):
+            pass
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, TYPE_CHECKING
 
 from sit_simulation.core.config import InsectConfig
 from sit_simulation.core.constants import StateNames
@@ -6,30 +6,65 @@ from sit_simulation.core.spatial_manager import SpatialManager
 from sit_simulation.states.base_state import InsectState
 from sit_simulation.states.state_factory import StateFactory
 
+if TYPE_CHECKING:
+    from sit_simulation.core.insect_manager import InsectManager
+
 
 class Insect:
+    """
+    One insect of the object engine. Insects only store their own data: the
+    spatial manager and insect configuration are those of the InsectManager
+    they belong to, and their state is the shared instance of its class.
+    Their age is not counted day by day but derived from the day they
+    entered their state.
+    """
+
+    __slots__ = (
+        'is_male', 'state', 'patch', 'manager',
+        'entered', 'duration', 'next_cycle', 'nb_cycles'
+    )
 
     def __init__(
             self,
             is_male: bool,
             state: StateNames,
             patch: int,
-            spatial_manager: SpatialManager,
-            config: InsectConfig
+            manager: 'InsectManager'
     ):
+        self._init_attributes(is_male, StateFactory.create_state(state), patch, manager)
+
+        self.spatial_manager.init_insect(self)
+
+        self.state.on_enter(self)
+
+    def _init_attributes(
+            self,
+            is_male: bool,
+            state: InsectState,
+            patch: int,
+            manager: 'InsectManager'
+    ) -> None:
         self.is_male = is_male
-        self.state = StateFactory.create_state(state)
+        self.state = state
         self.patch = patch
-        self.spatial_manager = spatial_manager
-        self.config = config
-        self.age = 0
+        self.manager = manager
+        self.entered = manager.day
         self.duration = 0
         self.next_cycle = 0
         self.nb_cycles = 0
 
-        self.spatial_manager.init_insect(self)
+    @property
+    def age(self) -> int:
+        """:return: days since the insect entered its state"""
+        return self.manager.day - self.entered
 
-        self.state.on_enter(self)
+    @property
+    def spatial_manager(self) -> SpatialManager:
+        return self.manager.spatial_manager
+
+    @property
+    def config(self) -> InsectConfig:
+        return self.manager.config
 
     def set_state(self, new_state: InsectState) -> None:
         if self.state:
@@ -37,7 +72,7 @@ class Insect:
 
         old_state = self.state
         self.state = new_state
-        self.age = 0
+        self.entered = self.manager.day
 
         self.spatial_manager.update_insect_state(self, old_state, new_state)
 
@@ -0,0 +1,142 @@
+import argparse
+import json
+from typing import Any, Dict, List
+
+from sit_simulation.benchmarks.benchmark_runner import compare, environment, measure_isolated
+from sit_simulation.benchmarks.scenario import canonical_scenarios
+from sit_simulation.core.constants import EngineTypes
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    phases = ', '.join(
+        f"{phase} {seconds:.2f}s"
+        for phase, seconds in sorted(result['phases'].items(), key=lambda item: -item[1])
+    )
+    print(
+        f"{result['scenario']:>16} {result['engine']:>10} "
+        f"{result['numbers_of_patches']:>6} patches {result['numbers_of_day']:>5} days "
+        f"{result['seconds']:>9.2f}s {result['insect_days_per_second']:>12.3e} insect-days/s "
+        f"{result['peak_rss_mb']:>8.1f} MB | {phases}",
+        flush=True
+    )
+
+
+def main(cli_args: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="SIT simulation benchmarks")
+
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="config",
+        help="Configuration folder the scenarios are derived from"
+    )
+
+    parser.add_argument(
+        "--engines",
+        type=EngineTypes,
+        nargs="+",
+        choices=list(EngineTypes),
+        default=[EngineTypes.VECTORIZED, EngineTypes.COHORT],
+        help="Engines to benchmark"
+    )
+
+    parser.add_argument(
+        "--scenarios",
+        nargs="*",
+        choices=["baseline", "high_release", "landscape", "long_horizon"],
+        default=["baseline", "high_release", "landscape", "long_horizon"],
+        help="Canonical scenarios to run"
+    )
+
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=None,
+        help="Horizon of the scenarios, that of the configuration by default"
+    )
+
+    parser.add_argument(
+        "--patches",
+        type=int,
+        nargs="*",
+        default=[4, 16, 64],
+        help="Numbers of patches of the scaling curve over the landscape size"
+    )
+
+    parser.add_argument(
+        "--populations",
+        type=float,
+        nargs="*",
+        default=[0.25, 1, 4],
+        help="Factors of the initial population and capacities of the scaling "
+             "curve over the population size"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs of each measurement, the fastest one being kept"
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of every run"
+    )
+
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default="benchmark_results.json",
+        help="JSON file receiving the results"
+    )
+
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        help="JSON results of a previous version to compare with"
+    )
+
+    args = parser.parse_args(cli_args)
+
+    scenarios = canonical_scenarios(args.config, args.days)
+    baseline = scenarios['baseline']
+    runs = [scenarios[name] for name in args.scenarios]
+    runs += [
+        baseline.with_landscape(f'patches_{numbers_of_patches}', numbers_of_patches)
+        for numbers_of_patches in args.patches
+    ]
+    runs += [
+        baseline.with_population_factor(f'population_x{factor:g}', factor)
+        for factor in args.populations
+    ]
+
+    results = []
+    for scenario in runs:
+        for engine_type in args.engines:
+            result = measure_isolated(scenario, engine_type, args.seed, args.repeat)
+            print_result(result)
+            results.append(result)
+
+    report = {'environment': environment(), 'results': results}
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            reference = json.load(file)
+        report['comparison'] = compare(results, reference['results'])
+        for comparison in report['comparison']:
+            print(
+                f"{comparison['scenario']:>16} {comparison['engine']:>10} "
+                f"x{comparison['speedup']:.2f} speed, x{comparison['memory_ratio']:.2f} memory"
+            )
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
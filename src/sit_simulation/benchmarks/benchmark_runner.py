@@ -0,0 +1,160 @@
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from sit_simulation.benchmarks.scenario import Scenario
+from sit_simulation.core.constants import EngineTypes, STATE_CODES, StateNames
+from sit_simulation.core.initial_insects import InitialInsects
+from sit_simulation.core.release_strategy import ReleaseStrategy
+from sit_simulation.core.simulation import Simulation
+from sit_simulation.core.spatial_manager import SpatialManager
+from sit_simulation.engines.engine_factory import EngineFactory
+from sit_simulation.observers.count_recorder import CountRecorder
+from sit_simulation.observers.profiling_observer import ProfilingObserver
+
+LIVING_CODES = [STATE_CODES[state] for state in StateNames if state != StateNames.DEAD]
+
+
+def measure(scenario: Scenario, engine_type: EngineTypes, seed: int) -> Dict[str, Any]:
+    """
+    Run ``scenario`` once with ``engine_type`` in this process, its phases
+    timed by a ProfilingObserver.
+
+    :return: timings, throughput and memory of the run
+    """
+    rss_start = _peak_rss_mb()
+
+    spatial_manager = SpatialManager(scenario.insect_config, scenario.simulation_config)
+    recorder = CountRecorder()
+    profiler = ProfilingObserver()
+
+    start = time.perf_counter()
+    simulation = Simulation(
+        insect_config=scenario.insect_config,
+        simulation_config=scenario.simulation_config,
+        release_strategy=ReleaseStrategy(scenario.release_strategy),
+        spatial_manager=spatial_manager,
+        initial_insects=InitialInsects(
+            scenario.initial_insects, spatial_manager, scenario.insect_config
+        ),
+        observers=[recorder, profiler],
+        engine=EngineFactory.create_engine(engine_type),
+        seed=seed,
+    )
+    populate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    simulation.run(tqdm_disable=True)
+    seconds = time.perf_counter() - start
+
+    totals = profiler.totals()
+    counters = {counter: int(totals.pop(counter, 0)) for counter in ProfilingObserver.COUNTERS}
+    phases = {phase: totals[phase] for phase in sorted(totals, key=totals.get, reverse=True)}
+    insect_days = int(recorder.counts[1:, :, LIVING_CODES].sum())
+
+    return {
+        'scenario': scenario.name,
+        'engine': str(engine_type),
+        'numbers_of_day': scenario.simulation_config.numbers_of_day,
+        'numbers_of_patches': scenario.simulation_config.numbers_of_patches,
+        'initial_population': int(recorder.counts[0, :, LIVING_CODES].sum()),
+        'final_population': int(recorder.counts[-1, :, LIVING_CODES].sum()),
+        'populate_seconds': populate_seconds,
+        'seconds': seconds,
+        'insect_days': insect_days,
+        'insect_days_per_second': insect_days / seconds if seconds > 0 else float('nan'),
+        'peak_rss_mb': _peak_rss_mb(),
+        'rss_increase_mb': _peak_rss_mb() - rss_start,
+        'phases': phases,
+        'counters': counters,
+    }
+
+
+def measure_isolated(
+        scenario: Scenario,
+        engine_type: EngineTypes,
+        seed: int,
+        repeat: int = 1
+) -> Dict[str, Any]:
+    """
+    ``measure`` in fresh processes, so that the peak memory is that of this
+    run only; the fastest of ``repeat`` runs is kept.
+    """
+    runs = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            runs.append(executor.submit(measure, scenario, engine_type, seed).result())
+
+    fastest = min(runs, key=lambda run: run['seconds'])
+    fastest['repeat'] = repeat
+    return fastest
+
+
+def environment() -> Dict[str, Any]:
+    """Versions and machine the results were measured with."""
+    try:
+        version = metadata.version('sit-mas-simulation')
+    except metadata.PackageNotFoundError:
+        version = None
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'version': version,
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def compare(results: List[Dict[str, Any]], reference: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    :return: for each run also found in ``reference`` (same scenario, engine,
+        days and patches), its throughput and time ratios to the reference
+    """
+    def key(result):
+        return (
+            result['scenario'], result['engine'],
+            result['numbers_of_day'], result['numbers_of_patches']
+        )
+
+    reference_by_key = {key(result): result for result in reference}
+    comparisons = []
+    for result in results:
+        previous = reference_by_key.get(key(result))
+        if previous is None:
+            continue
+        comparisons.append({
+            'scenario': result['scenario'],
+            'engine': result['engine'],
+            'speedup': previous['seconds'] / result['seconds'],
+            'memory_ratio': result['peak_rss_mb'] / previous['peak_rss_mb'],
+        })
+    return comparisons
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
@@ -0,0 +1,147 @@
+import dataclasses
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from sit_simulation.core.config import InsectConfig, SimulationConfig
+
+
+@dataclass
+class Scenario:
+    """Inputs of one benchmarked simulation, kept in memory."""
+    name: str
+    insect_config: InsectConfig
+    simulation_config: SimulationConfig
+    initial_insects: pd.DataFrame
+    release_strategy: pd.DataFrame
+
+    @classmethod
+    def load_from_folder(cls, name: str, config_folder: str) -> 'Scenario':
+        folder = Path(config_folder)
+        return cls(
+            name=name,
+            insect_config=InsectConfig.load_from_file(folder / 'insect_config.yaml'),
+            simulation_config=SimulationConfig.load_from_file(folder / 'simulation_config.yaml'),
+            initial_insects=pd.read_csv(folder / 'initial_insects.csv'),
+            release_strategy=pd.read_csv(folder / 'release_strategy.csv'),
+        )
+
+    def with_release_factor(self, name: str, factor: float) -> 'Scenario':
+        """Every release multiplied by ``factor``."""
+        release_strategy = self.release_strategy.copy()
+        columns = self._patch_columns(release_strategy)
+        release_strategy[columns] = (release_strategy[columns] * factor).round()
+        return dataclasses.replace(self, name=name, release_strategy=release_strategy)
+
+    def with_population_factor(self, name: str, factor: float) -> 'Scenario':
+        """Initial insects and egg capacities multiplied by ``factor``."""
+        initial_insects = self.initial_insects.copy()
+        columns = [column for column in initial_insects.columns if column != 'Patch']
+        initial_insects[columns] = (initial_insects[columns] * factor).round().astype(int)
+
+        simulation_config = dataclasses.replace(
+            self.simulation_config,
+            capacities=[int(capacity * factor) for capacity in self.simulation_config.capacities]
+        )
+        return dataclasses.replace(
+            self, name=name,
+            initial_insects=initial_insects, simulation_config=simulation_config
+        )
+
+    def with_horizon(self, name: str, numbers_of_day: int) -> 'Scenario':
+        """
+        Run for ``numbers_of_day`` days, the first release being repeated
+        every week until the end.
+        """
+        first = self.release_strategy.iloc[0]
+        columns = self._patch_columns(self.release_strategy)
+        days = range(int(first['day']), numbers_of_day, 7)
+        release_strategy = pd.DataFrame(
+            {'day': list(days), **{column: [first[column]] * len(days) for column in columns}}
+        )
+
+        simulation_config = dataclasses.replace(self.simulation_config, numbers_of_day=numbers_of_day)
+        return dataclasses.replace(
+            self, name=name,
+            simulation_config=simulation_config, release_strategy=release_strategy
+        )
+
+    def with_landscape(self, name: str, numbers_of_patches: int, diffusion_rate: float = 0.04) -> 'Scenario':
+        """
+        ``numbers_of_patches`` patches on a grid, patch i copying the initial
+        insects, mating rate, capacity and releases of patch
+        i % (original number of patches).
+        """
+        config = self.simulation_config
+        sources = np.arange(numbers_of_patches) % config.numbers_of_patches
+
+        width = max(
+            divisor for divisor in range(1, math.isqrt(numbers_of_patches) + 1)
+            if numbers_of_patches % divisor == 0
+        )
+        simulation_config = dataclasses.replace(
+            config,
+            numbers_of_patches=numbers_of_patches,
+            migration_rates={
+                'type': 'grid',
+                'width': width,
+                'height': numbers_of_patches // width,
+                'diffusion_rate': diffusion_rate,
+            },
+            mating_rates=[config.mating_rates[source] for source in sources],
+            capacities=[config.capacities[source] for source in sources],
+        )
+
+        by_patch = self.initial_insects.set_index('Patch')
+        initial_insects = by_patch.reindex(sources).fillna(0).astype(int).reset_index(drop=True)
+        initial_insects.insert(0, 'Patch', np.arange(numbers_of_patches))
+
+        release_strategy = pd.DataFrame({
+            'day': self.release_strategy['day'],
+            **{
+                str(patch): self.release_strategy.get(str(source), 0)
+                for patch, source in enumerate(sources)
+            }
+        })
+
+        return dataclasses.replace(
+            self, name=name,
+            simulation_config=simulation_config,
+            initial_insects=initial_insects,
+            release_strategy=release_strategy
+        )
+
+    def with_days(self, numbers_of_day: int) -> 'Scenario':
+        """Same scenario cut (or extended, without releases) to ``numbers_of_day``."""
+        return dataclasses.replace(
+            self,
+            simulation_config=dataclasses.replace(self.simulation_config, numbers_of_day=numbers_of_day)
+        )
+
+    @staticmethod
+    def _patch_columns(release_strategy: pd.DataFrame):
+        return [column for column in release_strategy.columns if str(column).isdigit()]
+
+
+def canonical_scenarios(config_folder: str, numbers_of_day: int = None) -> Dict[str, Scenario]:
+    """
+    The benchmark scenarios, all derived from the configuration in
+    ``config_folder``.
+
+    :param numbers_of_day: horizon of the baseline, that of the
+        configuration by default; the long horizon is four times longer
+    """
+    baseline = Scenario.load_from_folder('baseline', config_folder)
+    if numbers_of_day is not None:
+        baseline = baseline.with_days(numbers_of_day)
+    scenarios = [
+        baseline,
+        baseline.with_release_factor('high_release', 10),
+        baseline.with_landscape('landscape', 100),
+        baseline.with_horizon('long_horizon', 4 * baseline.simulation_config.numbers_of_day),
+    ]
+    return {scenario.name: scenario for scenario in scenarios}
@@ -0,0 +1,394 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.config import InsectConfig, SimulationConfig
+from sit_simulation.core.constants import EngineTypes, OutputFormats, STATE_CODES, StateNames
+from sit_simulation.core.ensemble import Ensemble
+from sit_simulation.core.initial_insects import InitialInsects
+from sit_simulation.core.random_streams import RandomStreams
+from sit_simulation.core.release_strategy import ReleaseStrategy
+from sit_simulation.core.simulation import Simulation
+from sit_simulation.core.spatial_manager import SpatialManager
+from sit_simulation.engines.engine_factory import EngineFactory
+from sit_simulation.observers.count_recorder import CountRecorder
+from sit_simulation.observers.data_collector import DataCollector
+from sit_simulation.observers.report_observer import ReportObserver
+from sit_simulation.outputs.output_factory import OutputFactory
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# states counted as the wild population compared by paired runs
+WILD_CODES = [
+    STATE_CODES[state] for state in StateNames if state not in (StateNames.SM, StateNames.DEAD)
+]
+
+
+class BatchRunner:
+    """
+    Runs many replicates of one setup. The configurations are loaded once and
+    sent once to each worker process, which then only receives replicate
+    numbers and sends back the (numbers_of_day + 1, numbers_of_patches,
+    len(StateNames)) counts of each run.
+
+    Replicate ``i`` runs with the random streams of (seed, i), so its result
+    does not depend on the number of workers or on the chunking.
+
+    With a burn-in, the first days are simulated once, with the streams of
+    the seed alone, and every replicate is forked from the end of that
+    shared burn-in with its own streams and release strategy.
+
+    With ``ensemble_size`` above 1, consecutive replicates are run together
+    as one Ensemble, with the streams of (seed, first replicate of the
+    ensemble). Replicate ``i`` then no longer gets the streams of (seed, i):
+    its result depends on the ensemble size, and only stays independent of
+    the number of workers and of the chunking for a given ensemble size.
+    """
+
+    def __init__(
+            self,
+            insect_config: InsectConfig,
+            simulation_config: SimulationConfig,
+            initial_insects: 'pd.DataFrame',
+            release_strategy: ReleaseStrategy | Callable[[int], ReleaseStrategy],
+            engine_type: EngineTypes = EngineTypes.OBJECT,
+            seed: int = None,
+            workers: int = None,
+            chunk_size: int = 1,
+            output: str = None,
+            plots: bool = False,
+            burn_in: int = 0,
+            agent_threshold: int = None,
+            ensemble_size: int = 1
+    ) -> None:
+        """
+        :param initial_insects: content of the initial insects file
+        :param release_strategy: strategy shared by every replicate, or
+            function returning the strategy of a replicate
+        :param seed: root seed, fresh entropy if None
+        :param workers: number of processes, one per CPU by default; 1 runs
+            the replicates in this process
+        :param chunk_size: replicates sent to a worker at a time
+        :param output: if given, folder receiving the patch CSV files of
+            replicate i in ``output/i``
+        :param plots: also render the PDF report of each replicate (needs
+            ``output``)
+        :param burn_in: days shared by every replicate; the release
+            strategies of the replicates must agree on them
+        :param agent_threshold: see HybridEngine
+        :param ensemble_size: replicates advanced together in one simulation,
+            see Ensemble; neither ``output`` nor ``burn_in`` apply to them
+        """
+        if ensemble_size > 1 and (output is not None or burn_in):
+            raise ValueError("Ensembles of replicates write no output folders and have no burn-in")
+
+        self.insect_config = insect_config
+        self.simulation_config = simulation_config
+        self.initial_insects = initial_insects
+        self.release_strategy = release_strategy
+        self.engine_type = engine_type
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.output = output
+        self.plots = plots
+        self.burn_in = burn_in
+        self.agent_threshold = agent_threshold
+        self.ensemble_size = ensemble_size
+        self._burn_in_simulation: Simulation = None
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """Shape of the counts of one replicate."""
+        return (
+            self.simulation_config.numbers_of_day + 1,
+            self.simulation_config.numbers_of_patches,
+            len(StateNames),
+        )
+
+    def run_replicate(self, replicate: int) -> np.ndarray:
+        """Run one replicate in this process and return its counts."""
+        if self.output is not None:
+            recorder = DataCollector(f'{self.output}/{replicate}')
+        else:
+            recorder = CountRecorder()
+        observers = [recorder]
+        if self.output is not None and self.plots:
+            observers.append(ReportObserver(f'{self.output}/{replicate}', recorder))
+
+        release_strategy = self.release_strategy
+        if not isinstance(release_strategy, ReleaseStrategy):
+            release_strategy = release_strategy(replicate)
+
+        if self.burn_in:
+            simulation = self._fork_burn_in(release_strategy, observers)
+            simulation.set_random_streams(RandomStreams(self.seed, replicate))
+        else:
+            simulation = self._create_simulation(release_strategy, observers, replicate)
+        simulation.run(tqdm_disable=True)
+
+        return recorder.counts
+
+    def run_ensemble(self, replicates: List[int]) -> np.ndarray:
+        """
+        Run ``replicates`` together in this process.
+
+        :return: (len(replicates), numbers_of_day + 1, numbers_of_patches,
+            len(StateNames)) counts
+        """
+        release_strategies = [
+            self.release_strategy if isinstance(self.release_strategy, ReleaseStrategy)
+            else self.release_strategy(replicate)
+            for replicate in replicates
+        ]
+        return Ensemble(
+            insect_config=self.insect_config,
+            simulation_config=self.simulation_config,
+            initial_insects=self.initial_insects,
+            release_strategies=release_strategies,
+            engine_type=self.engine_type,
+            seed=np.random.SeedSequence(self.seed, spawn_key=(replicates[0],)),
+            agent_threshold=self.agent_threshold,
+        ).run()
+
+    def burn_in_simulation(self) -> Simulation:
+        """
+        The simulation of the ``burn_in`` first days, run once and then
+        shared by every replicate.
+        """
+        if self._burn_in_simulation is None:
+            release_strategy = self.release_strategy
+            if not isinstance(release_strategy, ReleaseStrategy):
+                release_strategy = release_strategy(0)
+
+            simulation = self._create_simulation(release_strategy, [CountRecorder()])
+            simulation.run(tqdm_disable=True, until_day=self.burn_in)
+            self._burn_in_simulation = simulation
+        return self._burn_in_simulation
+
+    def _fork_burn_in(
+            self,
+            release_strategy: ReleaseStrategy,
+            observers: List[CountRecorder]
+    ) -> Simulation:
+        burn_in = self.burn_in_simulation()
+        numbers_of_patches = self.simulation_config.numbers_of_patches
+        for day in range(1, burn_in.current_day + 1):
+            if not np.array_equal(
+                    release_strategy.numbers_of_insects(day, numbers_of_patches),
+                    burn_in.release_strategy.numbers_of_insects(day, numbers_of_patches)
+            ):
+                raise ValueError(f"Release strategies differ on burn-in day {day}")
+
+        simulation = burn_in.fork([release_strategy], reseed=False)[0]
+        burn_in_counts = simulation.observers[0].counts
+        for observer in observers:
+            observer.counts = burn_in_counts.copy()
+        simulation.observers = observers
+        return simulation
+
+    def _create_simulation(
+            self,
+            release_strategy: ReleaseStrategy,
+            observers: List[CountRecorder],
+            replicate: int = None
+    ) -> Simulation:
+        spatial_manager = SpatialManager(self.insect_config, self.simulation_config)
+        return Simulation(
+            insect_config=self.insect_config,
+            simulation_config=self.simulation_config,
+            release_strategy=release_strategy,
+            spatial_manager=spatial_manager,
+            initial_insects=InitialInsects(
+                self.initial_insects, spatial_manager, self.insect_config
+            ),
+            observers=observers,
+            engine=EngineFactory.create_engine(
+                self.engine_type, agent_threshold=self.agent_threshold
+            ),
+            seed=self.seed,
+            replicate=replicate,
+        )
+
+    def imap(
+            self,
+            replicates: Iterable[int],
+            tqdm_disable: bool = True
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Run the replicates and yield (replicate, counts) in the order of
+        ``replicates`` as soon as each one is available.
+        """
+        from tqdm import tqdm
+
+        replicates = list(replicates)
+        progress = tqdm(total=len(replicates), disable=tqdm_disable)
+
+        if self.burn_in:
+            # run once here rather than once per worker
+            self.burn_in_simulation()
+
+        if self.ensemble_size > 1:
+            for replicate, counts in self._imap_ensembles(replicates):
+                yield replicate, counts
+                progress.update()
+        elif self.workers == 1:
+            for replicate in replicates:
+                yield replicate, self.run_replicate(replicate)
+                progress.update()
+        else:
+            with ProcessPoolExecutor(
+                    max_workers=min(self.workers, max(len(replicates), 1)),
+                    initializer=_init_worker,
+                    initargs=(self,)
+            ) as executor:
+                results = executor.map(
+                    _run_replicate, replicates, chunksize=self.chunk_size
+                )
+                for replicate, counts in zip(replicates, results):
+                    yield replicate, counts
+                    progress.update()
+
+        progress.close()
+
+    def _imap_ensembles(self, replicates: List[int]) -> Iterator[Tuple[int, np.ndarray]]:
+        ensembles = [
+            replicates[start:start + self.ensemble_size]
+            for start in range(0, len(replicates), self.ensemble_size)
+        ]
+        if self.workers == 1:
+            for ensemble in ensembles:
+                yield from zip(ensemble, self.run_ensemble(ensemble))
+            return
+
+        with ProcessPoolExecutor(
+                max_workers=min(self.workers, max(len(ensembles), 1)),
+                initializer=_init_worker,
+                initargs=(self,)
+        ) as executor:
+            results = executor.map(
+                _run_ensemble, ensembles,
+                chunksize=max(self.chunk_size // self.ensemble_size, 1)
+            )
+            for ensemble, counts in zip(ensembles, results):
+                yield from zip(ensemble, counts)
+
+    def run(self, replicates: Iterable[int], tqdm_disable: bool = True) -> np.ndarray:
+        """
+        :return: (len(replicates), numbers_of_day + 1, numbers_of_patches,
+            len(StateNames)) counts, in memory
+        """
+        replicates = list(replicates)
+        counts = np.zeros((len(replicates), *self.shape), dtype=np.int64)
+        for index, (_, replicate_counts) in enumerate(self.imap(replicates, tqdm_disable)):
+            counts[index] = replicate_counts
+        return counts
+
+    def run_paired(
+            self,
+            release_strategy: ReleaseStrategy | Callable[[int], ReleaseStrategy],
+            replicates: Iterable[int],
+            tqdm_disable: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the replicates under the release strategy of this runner, then
+        under ``release_strategy``, replicate ``i`` getting the streams of
+        (seed, i) both times. With the keyed engine, the wild insects of a
+        replicate then draw the same random numbers under both strategies,
+        see ``paired_statistics``.
+
+        :return: counts under each strategy, as returned by ``run``
+        """
+        if self.output is not None:
+            raise ValueError("Paired runs write no output folders")
+
+        replicates = list(replicates)
+        other = copy.copy(self)
+        other.release_strategy = release_strategy
+        return self.run(replicates, tqdm_disable), other.run(replicates, tqdm_disable)
+
+    @staticmethod
+    def paired_statistics(counts_a: np.ndarray, counts_b: np.ndarray) -> Dict[str, Any]:
+        """
+        Compare the final wild populations of paired runs, as returned by
+        ``run_paired``. The standard error of the mean difference is that
+        of the per-replicate differences; ``unpaired_standard_error`` is
+        what it would be with independent runs, their ratio squared being
+        the factor by which pairing cuts the replicates needed.
+        """
+        a = counts_a[:, -1][..., WILD_CODES].sum(axis=(1, 2)).astype(np.float64)
+        b = counts_b[:, -1][..., WILD_CODES].sum(axis=(1, 2)).astype(np.float64)
+        replicates = len(a)
+        difference = b - a
+        mean_difference = difference.mean()
+        standard_error = difference.std(ddof=1) / np.sqrt(replicates)
+        unpaired_standard_error = np.sqrt((a.var(ddof=1) + b.var(ddof=1)) / replicates)
+        return {
+            'replicates': replicates,
+            'mean_a': float(a.mean()),
+            'mean_b': float(b.mean()),
+            'mean_difference': float(mean_difference),
+            'difference_std': float(difference.std(ddof=1)),
+            'standard_error': float(standard_error),
+            'confidence_interval_95': [
+                float(mean_difference - 1.96 * standard_error),
+                float(mean_difference + 1.96 * standard_error),
+            ],
+            'unpaired_standard_error': float(unpaired_standard_error),
+            'correlation': float(np.corrcoef(a, b)[0, 1]),
+            'eliminated_a': float(np.mean(a == 0)),
+            'eliminated_b': float(np.mean(b == 0)),
+        }
+
+    def run_to_store(
+            self,
+            path: str,
+            replicates: Iterable[int],
+            output_format: OutputFormats = OutputFormats.NPZ,
+            tqdm_disable: bool = True
+    ) -> None:
+        """
+        Same as ``run``, but the counts are streamed to the batch store of
+        ``output_format`` in the folder ``path`` as the replicates complete,
+        instead of being held in memory.
+        """
+        replicates = list(replicates)
+        store = OutputFactory.create_output(output_format).create_store(
+            path, (len(replicates), *self.shape), self.metadata(replicates)
+        )
+        for index, (_, replicate_counts) in enumerate(self.imap(replicates, tqdm_disable)):
+            store[index] = replicate_counts
+        del store
+
+    def metadata(self, replicates: List[int]) -> Dict[str, Any]:
+        """Description of a batch stored next to its counts."""
+        return {
+            'numbers_of_day': self.simulation_config.numbers_of_day,
+            'numbers_of_patches': self.simulation_config.numbers_of_patches,
+            'states': [state.value for state in StateNames],
+            'engine': str(self.engine_type),
+            'entropy': str(self.seed),
+            'replicates': replicates,
+            'burn_in': self.burn_in,
+            'ensemble_size': self.ensemble_size,
+        }
+
+
+_batch_runner: BatchRunner = None
+
+
+def _init_worker(batch_runner: BatchRunner) -> None:
+    global _batch_runner
+    _batch_runner = batch_runner
+
+
+def _run_replicate(replicate: int) -> np.ndarray:
+    return _batch_runner.run_replicate(replicate)
+
+
+def _run_ensemble(replicates: List[int]) -> np.ndarray:
+    return _batch_runner.run_ensemble(replicates)
@@ -0,0 +1,29 @@
+from collections import defaultdict
+from typing import Dict, Generic, List, TypeVar
+
+T = TypeVar('T')
+
+
+class CalendarQueue(Generic[T]):
+    """
+    Items filed in one bucket per day, so that taking the items due on a day
+    costs as much as there are of them, whatever the number still waiting.
+
+    Items scheduled for a day already taken are filed under the next one.
+    """
+
+    def __init__(self, first_day: int = 0) -> None:
+        """:param first_day: earliest day items can be due on"""
+        self.buckets: Dict[int, List[T]] = defaultdict(list)
+        self.first_day = first_day
+
+    def schedule(self, day: int, item: T) -> None:
+        self.buckets[max(day, self.first_day)].append(item)
+
+    def pop(self, day: int) -> List[T]:
+        """:return: the items due on ``day``, in the order they were scheduled"""
+        self.first_day = max(self.first_day, day + 1)
+        return self.buckets.pop(day, [])
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self.buckets.values())
@@ -1,12 +1,14 @@
-from dataclasses import dataclass
+import functools
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, Any, List
 from typing import Tuple
 
 import numpy as np
-import yaml
 
 from sit_simulation.core.constants import ProbabilityDistribution
+from sit_simulation.core.random_variate_buffer import RandomVariateBuffer
 
 
 @dataclass
@@ -58,104 +60,204 @@ class InsectConfig:
     female_first_blood_dist: ProbabilityDistribution = ProbabilityDistribution.NORMAL
     female_first_blood_param: Tuple[float, ...] = (5.54, 0.82)
 
-    @classmethod
-    def egg_duration(cls) -> float:
-        return cls._simulate_rv(
-            cls.egg_duration_dist, cls.egg_duration_param
+    rng: np.random.Generator = field(
+        default_factory=np.random.default_rng, init=False, repr=False, compare=False
+    )
+    _buffers: Dict[str, RandomVariateBuffer] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def set_rng(self, rng: np.random.Generator) -> None:
+        """Draw from ``rng`` from now on, discarding the buffered variates."""
+        self.rng = rng
+        self._buffers.clear()
+
+    def egg_duration(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'egg_duration',
+            self.egg_duration_dist, self.egg_duration_param, size
         )
 
-    @classmethod
-    def egg_survive(cls) -> bool:
-        return cls._simulate_rv(
-            cls.egg_survive_dist, cls.egg_survive_param
+    def egg_survive(self, size: int = None) -> bool | np.ndarray:
+        return self._draw(
+            'egg_survive',
+            self.egg_survive_dist, self.egg_survive_param, size
         )
 
-    @classmethod
-    def larva_duration(cls) -> float:
-        return cls._simulate_rv(
-            cls.larva_duration_dist, cls.larva_duration_param
+    def larva_duration(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'larva_duration',
+            self.larva_duration_dist, self.larva_duration_param, size
         )
 
-    @classmethod
-    def larva_survive(cls) -> bool:
-        return cls._simulate_rv(
-            cls.larva_survive_dist, cls.larva_survive_param
+    def larva_survive(self, size: int = None) -> bool | np.ndarray:
+        return self._draw(
+            'larva_survive',
+            self.larva_survive_dist, self.larva_survive_param, size
         )
 
-    @classmethod
-    def pupa_duration(cls) -> float:
-        return cls._simulate_rv(
-            cls.pupa_duration_dist, cls.pupa_duration_param
+    def pupa_duration(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'pupa_duration',
+            self.pupa_duration_dist, self.pupa_duration_param, size
         )
 
-    @classmethod
-    def pupa_survive(cls) -> bool:
-        return cls._simulate_rv(
-            cls.pupa_survive_dist, cls.pupa_survive_param
+    def pupa_survive(self, size: int = None) -> bool | np.ndarray:
+        return self._draw(
+            'pupa_survive',
+            self.pupa_survive_dist, self.pupa_survive_param, size
         )
 
-    @classmethod
-    def wild_male_lifespan(cls) -> float:
-        return cls._simulate_rv(
-            cls.wild_male_lifespan_dist, cls.wild_male_lifespan_param
+    def wild_male_lifespan(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'wild_male_lifespan',
+            self.wild_male_lifespan_dist, self.wild_male_lifespan_param, size
         )
 
-    @classmethod
-    def sterile_male_lifespan(cls) -> float:
-        return cls._simulate_rv(
-            cls.sterile_male_lifespan_dist, cls.sterile_male_lifespan_param
+    def sterile_male_lifespan(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'sterile_male_lifespan',
+            self.sterile_male_lifespan_dist, self.sterile_male_lifespan_param, size
         )
 
-    @classmethod
-    def female_lifespan(cls) -> float:
-        return cls._simulate_rv(
-            cls.female_lifespan_dist, cls.female_lifespan_param
+    def female_lifespan(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'female_lifespan',
+            self.female_lifespan_dist, self.female_lifespan_param, size
         )
 
-    @classmethod
-    def female_mate_next_cycle(cls) -> float:
-        return cls._simulate_rv(
-            cls.female_mate_next_cycle_dist, cls.female_mate_next_cycle_param
+    def female_mate_next_cycle(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'female_mate_next_cycle',
+            self.female_mate_next_cycle_dist, self.female_mate_next_cycle_param, size
         )
 
-    @classmethod
-    def eggs_male_count(cls) -> float:
-        return cls._simulate_rv(
-            cls.eggs_male_dist, cls.eggs_male_param
+    def eggs_male_count(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'eggs_male_count',
+            self.eggs_male_dist, self.eggs_male_param, size
         )
 
-    @classmethod
-    def eggs_female_count(cls) -> float:
-        return cls._simulate_rv(
-            cls.eggs_female_dist, cls.eggs_female_param
+    def eggs_female_count(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'eggs_female_count',
+            self.eggs_female_dist, self.eggs_female_param, size
         )
 
-    @classmethod
-    def female_first_blood_meal(cls) -> float:
-        return cls._simulate_rv(
-            cls.female_first_blood_dist, cls.female_first_blood_param
+    def female_first_blood_meal(self, size: int = None) -> float | np.ndarray:
+        return self._draw(
+            'female_first_blood_meal',
+            self.female_first_blood_dist, self.female_first_blood_param, size
         )
 
+    def _draw(
+            self,
+            name: str,
+            distribution: ProbabilityDistribution,
+            params,
+            size: int = None
+    ):
+        """
+        :param size: number of variates to draw in one call, or None for a
+            single one served from the buffer of this distribution
+        """
+        if size is not None:
+            return self._simulate_rv(distribution, params, size)
+
+        buffer = self._buffers.get(name)
+        if buffer is None:
+            buffer = self._buffers[name] = RandomVariateBuffer(
+                functools.partial(self._simulate_rv, distribution, params)
+            )
+        return buffer.next()
+
+    def _simulate_rv(
+            self,
+            distribution: ProbabilityDistribution,
+            params,
+            size: int = None
+    ):
+        match distribution:
+            case ProbabilityDistribution.UNIFORM:
+                a = params[0]
+                b = params[1]
+                return (b - a) * self.rng.random(size) + a
+            case ProbabilityDistribution.GEOM:
+                return self.rng.geometric(*params, size=size)
+            case ProbabilityDistribution.NORMAL:
+                return np.maximum(self.rng.normal(*params, size=size), 0.1)
+            case ProbabilityDistribution.WEIBULL:
+                return params[1] * (-np.log(self.rng.random(size))) ** (1 / params[0])
+            case ProbabilityDistribution.BERNOULLI:
+                return self.rng.binomial(1, params[0], size=size)
+            case _:
+                raise ValueError(f"Unknown distribution: {distribution}")
+
     @staticmethod
-    def _simulate_rv(distribution: ProbabilityDistribution, params):
+    def from_uniforms(
+            distribution: ProbabilityDistribution,
+            params,
+            uniforms: np.ndarray
+    ) -> np.ndarray:
+        """
+        Variates distributed as those of ``_simulate_rv``, computed from
+        given uniform numbers rather than drawn from the generator.
+
+        :param uniforms: (draws, size) numbers in [0, 1), two draws for the
+            normal distribution and one for the others
+        """
+        u = uniforms[0]
         match distribution:
             case ProbabilityDistribution.UNIFORM:
                 a = params[0]
                 b = params[1]
-                return (b - a) * np.random.rand() + a
+                return (b - a) * u + a
+            case ProbabilityDistribution.GEOM:
+                with np.errstate(divide='ignore'):
+                    trials = np.ceil(np.log1p(-u) / np.log1p(-params[0]))
+                return np.maximum(np.nan_to_num(trials), 1).astype(np.int64)
+            case ProbabilityDistribution.NORMAL:
+                # Box-Muller transform
+                normal = np.sqrt(-2 * np.log1p(-u)) * np.cos(2 * np.pi * uniforms[1])
+                return np.maximum(params[0] + params[1] * normal, 0.1)
+            case ProbabilityDistribution.WEIBULL:
+                return params[1] * (-np.log1p(-u)) ** (1 / params[0])
+            case ProbabilityDistribution.BERNOULLI:
+                return (u < params[0]).astype(np.int64)
+            case _:
+                raise ValueError(f"Unknown distribution: {distribution}")
+
+    @staticmethod
+    def cdf(distribution: ProbabilityDistribution, params, x: np.ndarray) -> np.ndarray:
+        """
+        Probability that a variate drawn by ``_simulate_rv`` is lower than or
+        equal to each value of ``x``.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        match distribution:
+            case ProbabilityDistribution.UNIFORM:
+                low, high = sorted(params[:2])
+                if low == high:
+                    return (x >= low).astype(np.float64)
+                return np.clip((x - low) / (high - low), 0, 1)
             case ProbabilityDistribution.GEOM:
-                return np.random.geometric(*params)
+                return 1 - (1 - params[0]) ** np.maximum(np.floor(x), 0)
             case ProbabilityDistribution.NORMAL:
-                return max(np.random.normal(*params), 0.1)
+                erf = np.vectorize(math.erf, otypes=[np.float64])
+                normal = 0.5 * (1 + erf((x - params[0]) / (params[1] * math.sqrt(2))))
+                # variates below 0.1 are raised to it
+                return np.where(x < 0.1, 0, normal)
             case ProbabilityDistribution.WEIBULL:
-                return params[1] * (-np.log(np.random.rand())) ** (1 / params[0])
+                return 1 - np.exp(-(np.maximum(x, 0) / params[1]) ** params[0])
             case ProbabilityDistribution.BERNOULLI:
-                return np.random.binomial(1, params[0])
+                return np.select([x < 0, x < 1], [0, 1 - params[0]], 1)
             case _:
                 raise ValueError(f"Unknown distribution: {distribution}")
 
     @classmethod
     def load_from_file(cls, config_path: str) -> 'InsectConfig':
+        import yaml
+
         path = Path(config_path)
         with open(path, 'r') as f:
             config_data = yaml.safe_load(f)
@@ -170,12 +272,15 @@ class InsectConfig:
 class SimulationConfig:
     numbers_of_day: int = 50
     numbers_of_patches: int = 10
-    migration_rates: List[List[float]] = None
+    # dense rows or a sparse specification, see MigrationMatrix
+    migration_rates: List[List[float]] | Dict[str, Any] = None
     mating_rates: List[float] = None
     capacities: List[int] = None
 
     @classmethod
     def load_from_file(cls, config_path: str) -> 'SimulationConfig':
+        import yaml
+
         path = Path(config_path)
         with open(path, 'r') as f:
             config_data = yaml.safe_load(f)
@@ -21,6 +21,14 @@ ADULT_STATES = [
     StateNames.SF
 ]
 
+IMMATURE_STATES = [
+    StateNames.EGG,
+    StateNames.LARVA,
+    StateNames.PUPA
+]
+
+STATE_CODES = {state: code for code, state in enumerate(StateNames)}
+
 class InsectTypes(StrEnum):
     Sterile = "SterileInsect"
     Wild = "WildInsect"
@@ -30,4 +38,19 @@ class ProbabilityDistribution(StrEnum):
     GEOM = "geom"
     NORMAL = "norm"
     WEIBULL = "weibull"
-    BERNOULLI = "bernoulli"
\ No newline at end of file
+    BERNOULLI = "bernoulli"
+
+class EngineTypes(StrEnum):
+    OBJECT = "object"
+    VECTORIZED = "vectorized"
+    COHORT = "cohort"
+    SHARDED = "sharded"
+    MEAN_FIELD = "mean_field"
+    HYBRID = "hybrid"
+    KEYED = "keyed"
+
+class OutputFormats(StrEnum):
+    CSV = "csv"
+    NPZ = "npz"
+    PARQUET = "parquet"
+    ZARR = "zarr"
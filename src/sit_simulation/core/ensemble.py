@@ -0,0 +1,152 @@
+import dataclasses
+from typing import List, TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.config import InsectConfig, SimulationConfig
+from sit_simulation.core.constants import EngineTypes, StateNames
+from sit_simulation.core.initial_insects import InitialInsects
+from sit_simulation.core.migration_matrix import MigrationMatrix
+from sit_simulation.core.release_strategy import ReleaseStrategy
+from sit_simulation.core.simulation import Simulation
+from sit_simulation.core.spatial_manager import SpatialManager
+from sit_simulation.engines.engine_factory import EngineFactory
+from sit_simulation.observers.count_recorder import CountRecorder
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class Ensemble:
+    """
+    Replicates of one setup advanced together, as a single simulation over
+    one disconnected copy of the landscape per replicate: patch ``p`` of
+    replicate ``r`` is patch ``r * numbers_of_patches + p`` of the ensemble,
+    and replicate ``r`` releases the males of its own strategy. The engine
+    thus advances every replicate with the same array operations each day.
+
+    The replicates are folded into the patch axis rather than kept as a
+    leading axis of the engines' arrays, so the configuration of the
+    landscape, its migration table included (see MigrationMatrix.tile), is
+    copied once per replicate rather than shared.
+
+    Replicates share the random streams of the ensemble, each engine drawing
+    for all of them at once: they are independent draws of the same setup,
+    but not the draws the replicates get when run one by one or in an
+    ensemble of another size. A replicate's result therefore depends on the
+    ensemble it is run in.
+    """
+
+    def __init__(
+            self,
+            insect_config: InsectConfig,
+            simulation_config: SimulationConfig,
+            initial_insects: 'pd.DataFrame',
+            release_strategies: List[ReleaseStrategy],
+            engine_type: EngineTypes = EngineTypes.VECTORIZED,
+            seed: int | np.random.SeedSequence = None,
+            agent_threshold: int = None
+    ) -> None:
+        """
+        :param initial_insects: content of the initial insects file, the
+            initial population of every replicate
+        :param release_strategies: strategy of each replicate
+        :param agent_threshold: see HybridEngine
+        """
+        self.insect_config = insect_config
+        self.simulation_config = simulation_config
+        self.initial_insects = initial_insects
+        self.release_strategies = release_strategies
+        self.engine_type = engine_type
+        self.seed = seed
+        self.agent_threshold = agent_threshold
+
+    @property
+    def replicates(self) -> int:
+        return len(self.release_strategies)
+
+    def ensemble_config(self) -> SimulationConfig:
+        """Simulation configuration of the copies of the landscape."""
+        config = self.simulation_config
+        migration_matrix = MigrationMatrix.from_config(
+            config.migration_rates, config.numbers_of_patches
+        ).tile(self.replicates)
+        return dataclasses.replace(
+            config,
+            numbers_of_patches=self.replicates * config.numbers_of_patches,
+            migration_rates={
+                'type': 'csr',
+                'indptr': migration_matrix.indptr,
+                'indices': migration_matrix.indices,
+                'data': migration_matrix.data,
+            },
+            mating_rates=list(config.mating_rates) * self.replicates,
+            capacities=list(config.capacities) * self.replicates,
+        )
+
+    def ensemble_release_strategy(self) -> ReleaseStrategy:
+        """Releases of every replicate, each in its copy of the landscape."""
+        import pandas as pd
+
+        numbers_of_patches = self.simulation_config.numbers_of_patches
+        days = sorted({day for strategy in self.release_strategies for day in strategy.schedule})
+        releases = np.array([
+            np.concatenate([
+                strategy.numbers_of_insects(day, numbers_of_patches)
+                for strategy in self.release_strategies
+            ])
+            for day in days
+        ], dtype=np.int64).reshape(len(days), self.replicates * numbers_of_patches)
+
+        strategy = pd.DataFrame(
+            releases, columns=[str(patch) for patch in range(releases.shape[1])]
+        )
+        strategy.insert(0, 'day', days)
+        return ReleaseStrategy(strategy)
+
+    def ensemble_initial_insects(self) -> 'pd.DataFrame':
+        """Initial insects of every replicate, each in its copy of the landscape."""
+        import pandas as pd
+
+        numbers_of_patches = self.simulation_config.numbers_of_patches
+        return pd.concat(
+            [
+                self.initial_insects.assign(
+                    Patch=self.initial_insects['Patch'] + replicate * numbers_of_patches
+                )
+                for replicate in range(self.replicates)
+            ],
+            ignore_index=True
+        )
+
+    def run(self, tqdm_disable: bool = True) -> np.ndarray:
+        """
+        :return: (replicates, numbers_of_day + 1, numbers_of_patches,
+            len(StateNames)) counts
+        """
+        config = self.ensemble_config()
+        spatial_manager = SpatialManager(self.insect_config, config)
+        recorder = CountRecorder()
+        simulation = Simulation(
+            insect_config=self.insect_config,
+            simulation_config=config,
+            release_strategy=self.ensemble_release_strategy(),
+            spatial_manager=spatial_manager,
+            initial_insects=InitialInsects(
+                self.ensemble_initial_insects(), spatial_manager, self.insect_config
+            ),
+            observers=[recorder],
+            engine=EngineFactory.create_engine(
+                self.engine_type, agent_threshold=self.agent_threshold
+            ),
+            seed=self.seed,
+        )
+        simulation.run(tqdm_disable=tqdm_disable)
+
+        counts = recorder.counts.reshape(
+            config.numbers_of_day + 1,
+            self.replicates,
+            self.simulation_config.numbers_of_patches,
+            len(StateNames),
+        )
+        return np.ascontiguousarray(counts.swapaxes(0, 1))
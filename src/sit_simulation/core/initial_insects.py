@@ -1,17 +1,21 @@
-from typing import List
-
-import pandas as pd
+from typing import List, Tuple, TYPE_CHECKING
 
 from sit_simulation.agents.insect import Insect
 from sit_simulation.core.config import InsectConfig
+from sit_simulation.core.constants import StateNames
 from sit_simulation.core.spatial_manager import SpatialManager
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from sit_simulation.core.insect_manager import InsectManager
+
 
 class InitialInsects:
 
     def __init__(
         self,
-        initial_insects: pd.DataFrame,
+        initial_insects: 'pd.DataFrame',
         spatial_manager: SpatialManager,
         insect_config: InsectConfig
     ):
@@ -19,8 +23,11 @@ class InitialInsects:
         self.spatial_manager = spatial_manager
         self.insect_config = insect_config
 
-    def initial_insects_list(self) -> List[Insect]:
-        insects = []
+    def initial_insects_counts(self) -> List[Tuple[int, bool, StateNames, int]]:
+        """
+        :return: list of (patch, is_male, state, number) read from the file
+        """
+        counts = []
 
         for _, row in self.initial_insects.iterrows():
             patch = int(row['Patch'])
@@ -29,16 +36,15 @@ class InitialInsects:
                     (x[0] == 'Male', x[1]) if len(x := state.split()) == 2
                     else ('Male' in state, state)
                 )
-                insects.extend([
-                    Insect(
-                        is_male=male,
-                        state=state_name,
-                        patch=patch,
-                        spatial_manager=self.spatial_manager,
-                        config=self.insect_config
-                    )
-                    for _ in range(number)
-                ])
+                counts.append((patch, male, StateNames(state_name), int(number)))
+
+        return counts
+
+    def initial_insects_list(self, insect_manager: 'InsectManager') -> List[Insect]:
+        insects = []
+
+        for patch, male, state_name, number in self.initial_insects_counts():
+            insects.extend(insect_manager.create(number, male, state_name, patch))
 
         return insects
 
@@ -49,6 +55,8 @@ class InitialInsects:
         spatial_manager: SpatialManager,
         insect_config: InsectConfig
     ) -> 'InitialInsects':
+        import pandas as pd
+
         return cls(
             initial_insects=pd.read_csv(initial_insects_path),
             spatial_manager=spatial_manager,
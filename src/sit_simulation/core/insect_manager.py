@@ -1,26 +1,114 @@
-from typing import List
+import math
+from typing import Iterable, List
 
 from sit_simulation.agents.insect import Insect
+from sit_simulation.core.calendar_queue import CalendarQueue
+from sit_simulation.core.config import InsectConfig
+from sit_simulation.core.constants import StateNames
+from sit_simulation.core.spatial_manager import SpatialManager
+from sit_simulation.states.state_factory import StateFactory
 
 
 class InsectManager:
+    """
+    Insects of the object engine, and the calendar of what they do:
 
-    def __init__(self, initial_insects: List[Insect]):
-        self.current_list = 0
-        self.insect_lists = [[], []]
-        self.insect_lists[0] = initial_insects.copy()
+    - adults move every day; they are kept in ``adults`` and the dead ones
+      are compacted away once a day. Fertile females also look for a mate
+      every day, from ``fertile``;
+    - every other change happens on a day known in advance. On entering a
+      state, an insect is filed in ``transitions`` under the day it will
+      leave it, and mated females in ``clutches`` under the day of their
+      next laying. Eggs, larvae and pupae are only held by these calendars.
 
-    def is_empty(self) -> bool:
-        return not self.insect_lists[self.current_list]
+    Insects of the same manager share its spatial manager and configuration,
+    and dead insects are kept in a free list for reuse by ``create``.
+    """
 
-    def pop(self) -> Insect:
-        return self.insect_lists[self.current_list].pop()
+    def __init__(self, spatial_manager: SpatialManager, config: InsectConfig):
+        self.spatial_manager = spatial_manager
+        self.config = config
+        self.day = 0
+        self.adults: List[Insect] = []
+        self.fertile: List[Insect] = []
+        # day 0 is the initial population, the first simulated day is 1
+        self.transitions: CalendarQueue[Insect] = CalendarQueue(first_day=1)
+        self.clutches: CalendarQueue[Insect] = CalendarQueue(first_day=1)
+        self.free_insects: List[Insect] = []
 
-    def append(self, insect: Insect) -> None:
-        self.insect_lists[(1 + self.current_list) % 2].append(insect)
+    def create(
+            self,
+            number: int,
+            is_male: bool,
+            state: StateNames,
+            patch: int
+    ) -> List[Insect]:
+        """
+        ``number`` identical insects entering ``state`` together, as many
+        Insect(...) calls would create them, but registered in the spatial
+        manager at once and recycled from dead insects when possible.
+        """
+        insect_state = StateFactory.create_state(state)
+        self.spatial_manager.init_insects(patch, insect_state, number)
 
-    def extend(self, insects: List[Insect]) -> None:
-        self.insect_lists[(1 + self.current_list) % 2].extend(insects)
+        free_insects = self.free_insects
+        insects = []
+        for _ in range(number):
+            insect = free_insects.pop() if free_insects else Insect.__new__(Insect)
+            insect._init_attributes(is_male, insect_state, patch, self)
+            insect_state.on_enter(insect)
+            insects.append(insect)
+        return insects
 
-    def update(self) -> None:
-        self.current_list = (1 + self.current_list) % 2
\ No newline at end of file
+    def schedule_transition(self, insect: Insect) -> None:
+        """
+        File ``insect``, which just entered its state, under the first day
+        its age exceeds the duration of the state.
+        """
+        self.transitions.schedule(insect.entered + math.floor(insect.duration) + 1, insect)
+
+    def schedule_clutch(self, insect: Insect) -> None:
+        """File ``insect`` under the first day its age reaches its next cycle."""
+        self.clutches.schedule(insect.entered + math.ceil(insect.next_cycle), insect)
+
+    def add(self, insect: Insect) -> None:
+        """
+        Hold ``insect`` after it entered a new state: adults join ``adults``,
+        dead insects go to the free list, the others are already held by
+        the calendar.
+        """
+        state = insect.state
+        if state.is_adult:
+            self.adults.append(insect)
+        elif state.state_name is StateNames.DEAD:
+            self.free_insects.append(insect)
+
+    def extend(self, insects: Iterable[Insect]) -> None:
+        for insect in insects:
+            self.add(insect)
+
+    def take_fertile(self) -> List[Insect]:
+        """
+        :return: the fertile females looking for a mate today, those
+            becoming fertile from now on looking from tomorrow
+        """
+        fertile, self.fertile = self.fertile, []
+        return fertile
+
+    def compact(self) -> None:
+        """Remove the adults that died today, handing them to the free list."""
+        survivors = []
+        for insect in self.adults:
+            if insect.state.state_name is StateNames.DEAD:
+                self.free_insects.append(insect)
+            else:
+                survivors.append(insect)
+        self.adults = survivors
+
+    def __len__(self) -> int:
+        # an insect can be filed more than once, under days it no longer leaves on
+        immatures = {
+            id(insect) for insects in self.transitions.buckets.values() for insect in insects
+            if not insect.state.is_adult and insect.state.state_name is not StateNames.DEAD
+        }
+        return len(self.adults) + len(immatures)
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+class KeyedRandom:
+    """
+    Counter-based random numbers: each number is a hash of the seed and of
+    integer fields naming what it decides (an insect, a day, an event), so
+    that the same fields get the same number whatever was drawn before.
+    The hash chains the SplitMix64 finalizer over the fields.
+    """
+
+    def __init__(self, seed: int) -> None:
+        self.seed = np.uint64(seed)
+
+    def keys(self, *fields) -> np.ndarray:
+        """
+        :param fields: non-negative integers or arrays of them, broadcast
+            together
+        :return: 64-bit hash of the seed and of ``fields``
+        """
+        shape = np.broadcast_shapes(*(np.shape(field) for field in fields))
+        keys = np.full(shape, self.seed, dtype=np.uint64)
+        for field in fields:
+            keys = _mix(keys ^ np.asarray(field).astype(np.uint64))
+        return keys
+
+    def uniforms(self, *fields) -> np.ndarray:
+        """:return: numbers in [0, 1) of ``fields``, see ``keys``"""
+        return (self.keys(*fields) >> np.uint64(11)) * 2.0 ** -53
+
+
+def _mix(keys: np.ndarray) -> np.ndarray:
+    with np.errstate(over='ignore'):
+        keys = keys + np.uint64(0x9E3779B97F4A7C15)
+        keys = (keys ^ (keys >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        keys = (keys ^ (keys >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return keys ^ (keys >> np.uint64(31))
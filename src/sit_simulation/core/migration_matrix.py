@@ -0,0 +1,234 @@
+import bisect
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+class MigrationMatrix:
+    """
+    Daily migration probabilities between patches, stored in CSR form so that
+    memory and setup time grow with the number of non-zero edges only.
+
+    ``migration_rates`` in the simulation configuration may be:
+
+    - a dense list of rows, ``migration_rates[i][j]`` being the probability to
+      move from patch i to patch j;
+    - ``{'type': 'neighbours', 'neighbours': [[[j, rate], ...], ...]}``, the
+      non-zero entries of each row;
+    - ``{'type': 'csr', 'indptr': [...], 'indices': [...], 'data': [...]}``;
+    - ``{'type': 'grid', 'width': w, 'height': h, 'diffusion_rate': d}``, a
+      w x h grid of patches (patch = y * w + x) where an insect moves to each
+      of its four neighbours with probability d / 4 and stays otherwise.
+    """
+
+    def __init__(
+            self,
+            indptr: np.ndarray,
+            indices: np.ndarray,
+            data: np.ndarray
+    ) -> None:
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float64)
+
+        cumulative = np.concatenate([[0], np.cumsum(self.data)])
+        self._row_cdf = cumulative[1:] - np.repeat(
+            cumulative[self.indptr[:-1]], np.diff(self.indptr)
+        )
+        # cumulative rates offset by the row index, so that a single
+        # searchsorted serves every source patch
+        self._cdf = self.row_of_entries() + self._row_cdf
+        self._cdf_lists = None
+        self._by_destination = None
+
+    @property
+    def numbers_of_patches(self) -> int:
+        return len(self.indptr) - 1
+
+    @classmethod
+    def from_config(
+            cls,
+            migration_rates: List[List[float]] | Dict[str, Any],
+            numbers_of_patches: int
+    ) -> 'MigrationMatrix':
+        if not isinstance(migration_rates, dict):
+            matrix = cls.from_dense(migration_rates)
+        else:
+            match migration_rates.get('type'):
+                case 'neighbours':
+                    matrix = cls.from_neighbours(migration_rates['neighbours'])
+                case 'csr':
+                    matrix = cls(
+                        migration_rates['indptr'],
+                        migration_rates['indices'],
+                        migration_rates['data'],
+                    )
+                case 'grid':
+                    matrix = cls.grid(
+                        migration_rates['width'],
+                        migration_rates['height'],
+                        migration_rates['diffusion_rate'],
+                    )
+                case other:
+                    raise ValueError(f"Unknown migration rates type: {other}")
+
+        if matrix.numbers_of_patches != numbers_of_patches:
+            raise ValueError(
+                f"Migration rates describe {matrix.numbers_of_patches} patches, "
+                f"expected {numbers_of_patches}"
+            )
+        return matrix
+
+    @classmethod
+    def from_dense(cls, migration_rates: List[List[float]]) -> 'MigrationMatrix':
+        dense = np.asarray(migration_rates, dtype=np.float64)
+        rows, cols = np.nonzero(dense)
+        return cls.from_coo(rows, cols, dense[rows, cols], len(dense))
+
+    @classmethod
+    def from_neighbours(cls, neighbours: List[List[List[float]]]) -> 'MigrationMatrix':
+        rows, cols, rates = [], [], []
+        for patch, edges in enumerate(neighbours):
+            for destination, rate in edges:
+                rows.append(patch)
+                cols.append(int(destination))
+                rates.append(rate)
+        return cls.from_coo(
+            np.array(rows, dtype=np.int64),
+            np.array(cols, dtype=np.int64),
+            np.array(rates, dtype=np.float64),
+            len(neighbours)
+        )
+
+    @classmethod
+    def grid(cls, width: int, height: int, diffusion_rate: float) -> 'MigrationMatrix':
+        patches = np.arange(width * height)
+        x, y = patches % width, patches // width
+
+        rows = [patches]
+        cols = [patches]
+        rates = [np.full(len(patches), 1 - diffusion_rate)]
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            inside = (
+                (0 <= x + dx) & (x + dx < width)
+                & (0 <= y + dy) & (y + dy < height)
+            )
+            # moves off the grid are cancelled: the insect stays
+            rows.append(patches)
+            cols.append(np.where(inside, (y + dy) * width + (x + dx), patches))
+            rates.append(np.full(len(patches), diffusion_rate / 4))
+
+        return cls.from_coo(
+            np.concatenate(rows), np.concatenate(cols), np.concatenate(rates),
+            width * height
+        )
+
+    @classmethod
+    def from_coo(
+            cls,
+            rows: np.ndarray,
+            cols: np.ndarray,
+            rates: np.ndarray,
+            numbers_of_patches: int
+    ) -> 'MigrationMatrix':
+        """Build from (row, col, rate) triples, summing duplicate entries."""
+        keep = rates > 0
+        keys = rows[keep].astype(np.int64) * numbers_of_patches + cols[keep]
+        keys, inverse = np.unique(keys, return_inverse=True)
+        data = np.bincount(inverse, weights=rates[keep])
+        indptr = np.zeros(numbers_of_patches + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(keys // numbers_of_patches, minlength=numbers_of_patches),
+            out=indptr[1:]
+        )
+        return cls(indptr, keys % numbers_of_patches, data)
+
+    def tile(self, copies: int) -> 'MigrationMatrix':
+        """
+        Migration over ``copies`` disconnected copies of the landscape, patch
+        ``p`` of copy ``c`` being ``c * numbers_of_patches + p``.
+        """
+        entries = len(self.indices)
+        offsets = np.arange(copies)[:, None]
+        return MigrationMatrix(
+            np.append((self.indptr[:-1] + offsets * entries).ravel(), copies * entries),
+            (self.indices + offsets * self.numbers_of_patches).ravel(),
+            np.tile(self.data, copies),
+        )
+
+    def row_of_entries(self) -> np.ndarray:
+        """Source patch of each stored entry."""
+        return np.repeat(
+            np.arange(self.numbers_of_patches), np.diff(self.indptr)
+        )
+
+    def sample(self, patches: np.ndarray, uniforms: np.ndarray) -> np.ndarray:
+        """
+        Destination of insects leaving ``patches``, by inverse transform of
+        ``uniforms`` in [0, 1), with one binary search over all entries.
+        """
+        positions = np.searchsorted(self._cdf, patches + uniforms)
+        positions = np.clip(
+            positions, self.indptr[patches], self.indptr[patches + 1] - 1
+        )
+        return self.indices[positions]
+
+    def sample_one(self, patch: int, uniform: float) -> int:
+        """Scalar ``sample``, for the object engine."""
+        if self._cdf_lists is None:
+            self._cdf_lists = [
+                self._row_cdf[start:end].tolist()
+                for start, end in zip(self.indptr[:-1], self.indptr[1:])
+            ]
+        cdf = self._cdf_lists[patch]
+        position = min(bisect.bisect_left(cdf, uniform), len(cdf) - 1)
+        return int(self.indices[self.indptr[patch] + position])
+
+    def spread(self, densities: np.ndarray) -> np.ndarray:
+        """
+        Expected insects in each patch after one day of migration.
+
+        :param densities: (numbers_of_patches, ...) insects in each patch,
+            fractions of insects included
+        """
+        if self._by_destination is None:
+            order = np.argsort(self.indices, kind='stable')
+            destinations, starts = np.unique(self.indices[order], return_index=True)
+            self._by_destination = (
+                self.row_of_entries()[order], self.data[order][:, None], destinations, starts
+            )
+        sources, rates, destinations, starts = self._by_destination
+
+        flat = densities.reshape(self.numbers_of_patches, -1)
+        spread = np.zeros_like(flat)
+        if len(sources):
+            spread[destinations] = np.add.reduceat(rates * flat[sources], starts)
+        return spread.reshape(densities.shape)
+
+    def multinomial(
+            self,
+            patches: np.ndarray,
+            counts: np.ndarray,
+            rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Relocate groups of insects with one multinomial draw per group, over
+        the non-zero entries of its row only.
+
+        :return: (group index, destination, number of insects) of the
+            non-empty moves
+        """
+        degrees = np.diff(self.indptr)[patches]
+        width = int(degrees.max()) if len(patches) else 0
+        offsets = np.arange(width)
+        present = offsets < degrees[:, None]
+        positions = np.where(present, self.indptr[patches][:, None] + offsets, 0)
+
+        probabilities = np.where(present, self.data[positions], 0)
+        moved = rng.multinomial(counts, probabilities)
+        groups, columns = np.nonzero(moved)
+        return (
+            groups,
+            self.indices[positions[groups, columns]],
+            moved[groups, columns]
+        )
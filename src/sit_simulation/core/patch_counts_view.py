@@ -0,0 +1,23 @@
+from collections.abc import Mapping
+from typing import Iterator
+
+import numpy as np
+
+from sit_simulation.core.constants import STATE_CODES, StateNames
+
+
+class PatchCountsView(Mapping):
+    """Read-only mapping StateNames -> number of insects over one patch row."""
+
+    def __init__(self, counts: np.ndarray, patch: int) -> None:
+        self.counts = counts
+        self.patch = patch
+
+    def __getitem__(self, state: StateNames) -> int:
+        return int(self.counts[self.patch, STATE_CODES[state]])
+
+    def __iter__(self) -> Iterator[StateNames]:
+        return iter(StateNames)
+
+    def __len__(self) -> int:
+        return len(StateNames)
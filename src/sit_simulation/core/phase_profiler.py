@@ -0,0 +1,45 @@
+import time
+from collections import defaultdict
+from typing import Dict
+
+
+class PhaseProfiler:
+    """
+    Time spent in each phase of the current day, and counters of the insects
+    created, released and killed during it. Engines mark the end of each of
+    their phases with ``tick``; a disabled profiler ignores every call, so
+    that engines need not test whether profiling is on.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self._mark = time.perf_counter()
+
+    def start_day(self) -> None:
+        """Forget the previous day and start timing from now."""
+        if not self.enabled:
+            return
+        self.seconds.clear()
+        self.counters.clear()
+        self._mark = time.perf_counter()
+
+    def tick(self, phase: str) -> None:
+        """Charge the time elapsed since the previous tick to ``phase``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.seconds[phase] += now - self._mark
+        self._mark = now
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Charge ``seconds`` measured by the caller to ``phase``."""
+        if not self.enabled:
+            return
+        self.seconds[phase] += seconds
+
+    def count(self, counter: str, number: int = 1) -> None:
+        if not self.enabled:
+            return
+        self.counters[counter] += int(number)
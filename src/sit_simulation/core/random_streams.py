@@ -0,0 +1,40 @@
+from typing import List
+
+import numpy as np
+
+
+class RandomStreams:
+    """
+    Independent numpy Generators, one per subsystem of a simulation, derived
+    from a single SeedSequence. Replicate ``i`` of seed ``s`` always gets the
+    same streams, whichever process runs it and in whichever order.
+    """
+
+    SUBSYSTEMS = ('insect_config', 'spatial_manager', 'engine', 'release_strategy')
+
+    def __init__(
+            self,
+            seed: int | np.random.SeedSequence = None,
+            replicate: int = None
+    ) -> None:
+        """
+        :param seed: root seed, or None for fresh entropy
+        :param replicate: index of the replicate run from this seed
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(
+                seed, spawn_key=() if replicate is None else (replicate,)
+            )
+
+        streams = self.seed_sequence.spawn(len(self.SUBSYSTEMS))
+        for name, seed_sequence in zip(self.SUBSYSTEMS, streams):
+            setattr(self, name, np.random.default_rng(seed_sequence))
+
+    def spawn(self, number: int) -> List['RandomStreams']:
+        """Streams for ``number`` child simulations, independent of these."""
+        return [
+            RandomStreams(seed_sequence)
+            for seed_sequence in self.seed_sequence.spawn(number)
+        ]
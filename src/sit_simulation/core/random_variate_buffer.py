@@ -0,0 +1,35 @@
+from typing import Callable
+
+import numpy as np
+
+
+class RandomVariateBuffer:
+    """
+    Pre-filled buffer of random variates of one distribution, refilled in
+    chunks so that scalar draws do not pay one NumPy call each.
+    """
+
+    def __init__(
+            self,
+            sampler: Callable[[int], np.ndarray],
+            chunk_size: int = 4096
+    ) -> None:
+        """
+        :param sampler: function drawing an array of the given size
+        :param chunk_size: number of variates drawn at each refill
+        """
+        self.sampler = sampler
+        self.chunk_size = chunk_size
+        self._values = []
+        self._position = 0
+
+    def next(self):
+        if self._position == len(self._values):
+            self.refill()
+        value = self._values[self._position]
+        self._position += 1
+        return value
+
+    def refill(self) -> None:
+        self._values = self.sampler(self.chunk_size).tolist()
+        self._position = 0
@@ -1,40 +1,74 @@
-import pandas as pd
+from typing import Dict, List, TYPE_CHECKING
+
+import numpy as np
 
 from sit_simulation.agents.insect import Insect
 from sit_simulation.core.constants import StateNames
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from sit_simulation.core.insect_manager import InsectManager
+
 
 class ReleaseStrategy:
+    """
+    Sterile males released each day in each patch. The strategy table, a
+    ``day`` column and one column per patch index, is compiled once into a
+    map from each release day to the number of males released per patch.
+    """
 
-    def __init__(self, strategy: pd.DataFrame):
+    def __init__(self, strategy: 'pd.DataFrame'):
         self.strategy = strategy.astype('int')
 
+        patch_columns = {
+            int(column): column
+            for column in self.strategy.columns if str(column).isdigit()
+        }
+        releases = np.zeros(
+            (len(self.strategy), max(patch_columns, default=-1) + 1), dtype=np.int64
+        )
+        for patch, column in patch_columns.items():
+            releases[:, patch] = self.strategy[column].to_numpy()
+
+        self.schedule: Dict[int, np.ndarray] = {}
+        for day, patch_releases in zip(self.strategy['day'].tolist(), releases):
+            # the first row of a day wins
+            self.schedule.setdefault(day, patch_releases)
+
     def number_of_insects(self, day, patch):
-        try:
-            series = self.strategy.loc[self.strategy['day'] == day, str(patch)]
-            return series.values[0]
-        except:
+        releases = self.schedule.get(day)
+        if releases is None or patch >= len(releases):
             return 0
+        return int(releases[patch])
 
-    def release(self, simulation: 'Simulation'):
-        insects_to_release = []
+    def numbers_of_insects(self, day: int, numbers_of_patches: int) -> np.ndarray:
+        """:return: males released on ``day`` in each patch"""
+        numbers = np.zeros(numbers_of_patches, dtype=np.int64)
+        releases = self.schedule.get(day)
+        if releases is not None:
+            width = min(len(releases), numbers_of_patches)
+            numbers[:width] = releases[:width]
+        return numbers
+
+    def release(self, simulation: 'Simulation', insect_manager: 'InsectManager') -> List[Insect]:
+        numbers = self.numbers_of_insects(
+            simulation.current_day, simulation.simulation_config.numbers_of_patches
+        )
 
-        for patch in range(simulation.simulation_config.numbers_of_patches):
-            insects_to_release.extend([
-                Insect(
-                    is_male=True,
-                    state=StateNames.SM,
-                    patch=patch,
-                    spatial_manager=simulation.spatial_manager,
-                    config=simulation.insect_config
-                )
-                for _ in range(
-                    self.number_of_insects(simulation.current_day, patch)
-                )
-            ])
+        insects_to_release = []
+        for patch in np.flatnonzero(numbers).tolist():
+            insects_to_release.extend(insect_manager.create(
+                number=int(numbers[patch]),
+                is_male=True,
+                state=StateNames.SM,
+                patch=patch
+            ))
 
         return insects_to_release
 
     @classmethod
     def load_from_file(cls, release_strategy_path: str) -> 'ReleaseStrategy':
-        return cls(pd.read_csv(release_strategy_path))
\ No newline at end of file
+        import pandas as pd
+
+        return cls(pd.read_csv(release_strategy_path))
@@ -1,63 +1,164 @@
-from typing import List
+import gzip
+import os
+import pickle
+from typing import Iterable, List
 
-from tqdm import tqdm
+import numpy as np
 
-from sit_simulation.agents.insect import Insect
 from sit_simulation.core.config import SimulationConfig, InsectConfig
-from sit_simulation.core.constants import StateNames
-from sit_simulation.core.insect_manager import InsectManager
+from sit_simulation.core.initial_insects import InitialInsects
+from sit_simulation.core.phase_profiler import PhaseProfiler
+from sit_simulation.core.random_streams import RandomStreams
 from sit_simulation.core.release_strategy import ReleaseStrategy
 from sit_simulation.core.spatial_manager import SpatialManager
+from sit_simulation.engines.base_engine import SimulationEngine
+from sit_simulation.engines.object_engine import ObjectEngine
 from sit_simulation.observers.base_observer import SimulationObserver
 
 
 class Simulation:
 
+    # gzip level of checkpoints, fast rather than smallest
+    CHECKPOINT_COMPRESSION = 1
+
     def __init__(
             self,
             insect_config: InsectConfig,
             simulation_config: SimulationConfig,
             release_strategy: ReleaseStrategy,
             spatial_manager: SpatialManager,
-            initial_insects: List[Insect],
-            observers: List[SimulationObserver]
+            initial_insects: InitialInsects,
+            observers: List[SimulationObserver],
+            engine: SimulationEngine = None,
+            seed: int | np.random.SeedSequence = None,
+            replicate: int = None
     ):
         self.insect_config = insect_config
         self.simulation_config = simulation_config
         self.release_strategy = release_strategy
         self.spatial_manager = spatial_manager
-        self.insect_manager = InsectManager(initial_insects)
+        self.engine = engine if engine is not None else ObjectEngine()
         self.observers = observers
         self.current_day = 0
 
+        # phases are only timed for the observers listening to on_phase
+        self.phase_observers = [observer for observer in observers if observer.profiles()]
+        self.profiler = PhaseProfiler(enabled=bool(self.phase_observers))
+
+        self.set_random_streams(RandomStreams(seed, replicate))
+
+        self.engine.populate(self, initial_insects)
+
+    def set_random_streams(self, random_streams: RandomStreams) -> None:
+        """Draw every random number from ``random_streams`` from now on."""
+        self.random_streams = random_streams
+        self.insect_config.set_rng(random_streams.insect_config)
+        self.spatial_manager.set_rng(random_streams.spatial_manager)
+
     def update(self):
         self.current_day += 1
 
-        while not self.insect_manager.is_empty():
-            insect = self.insect_manager.pop()
-            insect.update()
-
-            if insect.state.state_name == StateNames.DEAD:
-                continue
+        if not self.phase_observers:
+            self.engine.update(self)
 
-            self.insect_manager.extend(insect.reproduce())
-            self.insect_manager.append(insect)
+            for observer in self.observers:
+                observer.update(self)
+            return
 
-        self.insect_manager.extend(self.release_strategy.release(self))
-        self.insect_manager.update()
+        profiler = self.profiler
+        profiler.start_day()
+        self.engine.update(self)
+        profiler.tick('engine')
 
         for observer in self.observers:
             observer.update(self)
-
-    def run(self, tqdm_disable: bool = False):
-        for observer in self.observers:
-            observer.on_enter(self)
-
-        for _ in tqdm(range(self.simulation_config.numbers_of_day), disable=tqdm_disable):
-            self.update()
+            profiler.tick(f'observer.{type(observer).__name__}')
+
+        for observer in self.phase_observers:
+            for phase, seconds in profiler.seconds.items():
+                observer.on_phase(self, phase, seconds)
+
+    def run(self, tqdm_disable: bool = False, until_day: int = None):
+        """
+        Simulate the days up to ``until_day``, the last one by default. A
+        simulation stopped before its last day, or restored from a
+        checkpoint, resumes from its current day; the observers only enter on
+        day 0 and exit after the last day.
+        """
+        numbers_of_day = self.simulation_config.numbers_of_day
+        until_day = numbers_of_day if until_day is None else min(until_day, numbers_of_day)
+
+        if self.current_day == 0:
+            for observer in self.observers:
+                observer.on_enter(self)
+
+        try:
+            days = range(self.current_day, until_day)
+            if not tqdm_disable:
+                from tqdm import tqdm
+                days = tqdm(days, initial=self.current_day, total=numbers_of_day)
+
+            for _ in days:
+                self.update()
+        except BaseException:
+            self.engine.close()
+            raise
+
+        if self.current_day < numbers_of_day:
+            return
+        self.engine.close()
 
         for observer in self.observers:
             observer.on_exit(self)
 
-
-
+    def checkpoint(self, path: str) -> None:
+        """
+        Write the whole state of the simulation to ``path``, a compressed
+        pickle: population, spatial counters, random streams, current day,
+        release strategy and observers with their buffers.
+
+        The checkpoint is written next to ``path`` and then moved onto it, so
+        that a crash while writing leaves the previous checkpoint intact. A
+        checkpoint that fails to be written is removed.
+        """
+        temporary_path = f'{path}.tmp'
+        try:
+            with gzip.open(temporary_path, 'wb', compresslevel=self.CHECKPOINT_COMPRESSION) as file:
+                pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def restore(path: str) -> 'Simulation':
+        """:return: the simulation saved by ``checkpoint`` in ``path``"""
+        with gzip.open(path, 'rb') as file:
+            return pickle.load(file)
+
+    def fork(
+            self,
+            release_strategies: Iterable[ReleaseStrategy],
+            reseed: bool = True
+    ) -> List['Simulation']:
+        """
+        Independent copies of this simulation at its current day, one per
+        release strategy, each with copies of the observers and their
+        buffers.
+
+        :param reseed: give each copy its own random streams, spawned from
+            those of this simulation; otherwise every copy continues these
+            streams and the copies only differ by their releases
+        """
+        snapshot = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+        children = []
+        for release_strategy in release_strategies:
+            child = pickle.loads(snapshot)
+            child.release_strategy = release_strategy
+            children.append(child)
+
+        if reseed:
+            for child, random_streams in zip(children, self.random_streams.spawn(len(children))):
+                child.set_random_streams(random_streams)
+        return children
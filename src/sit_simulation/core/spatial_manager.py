@@ -1,10 +1,9 @@
-import random
-from collections import defaultdict
-
 import numpy as np
 
 from sit_simulation.core.config import SimulationConfig, InsectConfig
-from sit_simulation.core.constants import StateNames
+from sit_simulation.core.constants import STATE_CODES, StateNames
+from sit_simulation.core.migration_matrix import MigrationMatrix
+from sit_simulation.core.patch_counts_view import PatchCountsView
 from sit_simulation.states.base_state import InsectState
 
 
@@ -17,25 +16,37 @@ class SpatialManager:
     ) -> None:
         self.insect_config = insect_config
         self.simulation_config = simulation_config
-        self.cdf_migration_rates = np.cumsum(
-            self.simulation_config.migration_rates, axis=1
+        self.migration_matrix = MigrationMatrix.from_config(
+            self.simulation_config.migration_rates,
+            self.simulation_config.numbers_of_patches
+        )
+        # counts[patch, STATE_CODES[state]]: number of insects of each state
+        self.counts = np.zeros(
+            (self.simulation_config.numbers_of_patches, len(StateNames)),
+            dtype=np.int64
         )
         self.numbers_of_insects = [
-            defaultdict(int)
-            for _ in range(self.simulation_config.numbers_of_patches)
+            PatchCountsView(self.counts, patch)
+            for patch in range(self.simulation_config.numbers_of_patches)
         ]
+        self.rng = np.random.default_rng()
+
+    def set_rng(self, rng: np.random.Generator) -> None:
+        """Use ``rng`` for mating and migration draws."""
+        self.rng = rng
 
     def update_insect_state(self, insect: 'Insect', old_state: InsectState, new_state: InsectState):
-        self.numbers_of_insects[insect.patch][old_state.state_name] += -1
-        self.numbers_of_insects[insect.patch][new_state.state_name] += 1
+        self.counts[insect.patch, old_state.state_code] += -1
+        self.counts[insect.patch, new_state.state_code] += 1
 
     def update_insect_patch(self, insect: 'Insect'):
-        if insect.state.state_name in [StateNames.EGG, StateNames.LARVA, StateNames.PUPA]:
+        if not insect.state.is_adult:
             return
 
         new_patch = self._random_patch(insect.patch)
-        self.numbers_of_insects[insect.patch][insect.state.state_name] += -1
-        self.numbers_of_insects[new_patch][insect.state.state_name] += 1
+        state_code = insect.state.state_code
+        self.counts[insect.patch, state_code] += -1
+        self.counts[new_patch, state_code] += 1
         insect.patch = new_patch
 
 
@@ -44,15 +55,15 @@ class SpatialManager:
         :param insect:
         :return: return 0 if nothing happened, 1 if mate is fertile and -1 if is sterile
         """
-        if random.random() >= self.simulation_config.mating_rates[insect.patch]:
+        if self.rng.random() >= self.simulation_config.mating_rates[insect.patch]:
             return 0
 
-        wm_number = self.numbers_of_insects[insect.patch][StateNames.WM]
-        sm_number = self.numbers_of_insects[insect.patch][StateNames.SM]
+        wm_number = self.counts[insect.patch, STATE_CODES[StateNames.WM]]
+        sm_number = self.counts[insect.patch, STATE_CODES[StateNames.SM]]
         competitiveness = self.insect_config.sterile_male_competitiveness
 
         is_fertile = (
-                random.uniform(0, wm_number + competitiveness * sm_number)
+                self.rng.uniform(0, wm_number + competitiveness * sm_number)
                 < wm_number
         )
 
@@ -69,7 +80,7 @@ class SpatialManager:
             0,
             (
                 self.simulation_config.capacities[insect.patch]
-                - self.numbers_of_insects[insect.patch][StateNames.EGG]
+                - self.counts[insect.patch, STATE_CODES[StateNames.EGG]]
             )
         )
 
@@ -83,12 +94,32 @@ class SpatialManager:
 
         return int(nb_male_eggs), int(nb_female_eggs)
 
+    def random_patches(self, patches: np.ndarray) -> np.ndarray:
+        """
+        Batched _random_patch, one binary search per insect.
+
+        :param patches: current patch of each migrating insect
+        :return: new patch of each insect
+        """
+        return self.migration_matrix.sample(patches, self.rng.random(len(patches)))
+
+    def migrate_counts(self, patches: np.ndarray, counts: np.ndarray):
+        """
+        Relocate whole groups of insects with one multinomial draw per group.
+
+        :param patches: patch of each group
+        :param counts: number of insects of each group
+        :return: (group index, new patch, number of insects) of each non-empty
+            move
+        """
+        return self.migration_matrix.multinomial(patches, counts, self.rng)
+
     def _random_patch(self, patch):
-        new_patch = 0
-        r = random.random()
-        while self.cdf_migration_rates[patch][new_patch] < r:
-            new_patch += 1
-        return new_patch
+        return self.migration_matrix.sample_one(patch, self.rng.random())
 
     def init_insect(self, insect: 'Insect'):
-        self.numbers_of_insects[insect.patch][insect.state.state_name] += 1
+        self.counts[insect.patch, insect.state.state_code] += 1
+
+    def init_insects(self, patch: int, state: InsectState, number: int):
+        """Register ``number`` new insects in ``state`` at once."""
+        self.counts[patch, state.state_code] += number
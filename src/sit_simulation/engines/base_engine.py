@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.constants import STATE_CODES, StateNames
+
+if TYPE_CHECKING:
+    from sit_simulation.core.initial_insects import InitialInsects
+    from sit_simulation.core.simulation import Simulation
+
+
+class SimulationEngine(ABC):
+    """Base class for the population engines driven by Simulation."""
+
+    @abstractmethod
+    def populate(
+            self,
+            simulation: 'Simulation',
+            initial_insects: 'InitialInsects'
+    ) -> None:
+        """Build the initial population and register it in the spatial manager."""
+        pass
+
+    @abstractmethod
+    def update(self, simulation: 'Simulation') -> None:
+        """Advance the population by one day, releases included."""
+        pass
+
+    def close(self) -> None:
+        """Release the resources held by the engine, once the run is over."""
+        pass
+
+    @staticmethod
+    def write_counts(
+            simulation: 'Simulation',
+            counts: np.ndarray,
+            dead_counts: np.ndarray
+    ) -> None:
+        """
+        Overwrite the spatial manager counters with the engine's own.
+
+        :param counts: (numbers_of_patches, len(StateNames)) living insects
+        :param dead_counts: insects dead so far in each patch
+        """
+        spatial_counts = simulation.spatial_manager.counts
+        spatial_counts[:] = counts
+        spatial_counts[:, STATE_CODES[StateNames.DEAD]] = dead_counts
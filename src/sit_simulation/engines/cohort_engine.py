@@ -0,0 +1,366 @@
+from typing import Dict, TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.config import InsectConfig
+from sit_simulation.core.constants import (
+    ADULT_STATES, STATE_CODES, ProbabilityDistribution, StateNames
+)
+from sit_simulation.engines.base_engine import SimulationEngine
+from sit_simulation.engines.cohort_table import CohortTable
+from sit_simulation.engines.delay_distribution import DelayDistribution
+
+if TYPE_CHECKING:
+    from sit_simulation.core.initial_insects import InitialInsects
+    from sit_simulation.core.simulation import Simulation
+
+EGG = STATE_CODES[StateNames.EGG]
+LARVA = STATE_CODES[StateNames.LARVA]
+PUPA = STATE_CODES[StateNames.PUPA]
+WM = STATE_CODES[StateNames.WM]
+SM = STATE_CODES[StateNames.SM]
+YF = STATE_CODES[StateNames.YF]
+FF = STATE_CODES[StateNames.FF]
+MF = STATE_CODES[StateNames.MF]
+SF = STATE_CODES[StateNames.SF]
+DEAD = STATE_CODES[StateNames.DEAD]
+
+ADULT_CODES = np.array([STATE_CODES[state] for state in ADULT_STATES])
+
+
+class CohortEngine(SimulationEngine):
+    """
+    Population stored as cohorts of identical insects (see CohortTable).
+    Durations are tabulated once, exactly, as distributions of whole days
+    (see DelayDistribution), and survival, mating, migration and durations
+    are drawn binomially/multinomially per cohort, so the daily cost grows
+    with the number of cohorts rather than with the number of insects.
+
+    A fresh duration ``d`` ends after ``floor(d) + 1`` days, as in
+    InsectState.update. The fractional part of the durations carried over by
+    females (YoungFemaleState and FertileFemaleState.on_exit) is not kept: it
+    is drawn again, uniformly, when the next lifespan is added.
+    """
+
+    def __init__(self) -> None:
+        self.cohorts = CohortTable()
+        self.dead_counts = np.zeros(0, dtype=np.int64)
+        self.delays: Dict[str, DelayDistribution] = {}
+        self.survival: Dict[int, float] = {}
+
+    def populate(
+            self,
+            simulation: 'Simulation',
+            initial_insects: 'InitialInsects'
+    ) -> None:
+        config = simulation.insect_config
+        numbers_of_patches = simulation.simulation_config.numbers_of_patches
+        self.cohorts = CohortTable()
+        self.dead_counts = np.zeros(numbers_of_patches, dtype=np.int64)
+        self.delays = self._tabulate_delays(config)
+        self.survival = {
+            EGG: _bernoulli_parameter(config.egg_survive_dist, config.egg_survive_param),
+            LARVA: _bernoulli_parameter(config.larva_survive_dist, config.larva_survive_param),
+            PUPA: _bernoulli_parameter(config.pupa_survive_dist, config.pupa_survive_param),
+        }
+
+        for patch, is_male, state, number in initial_insects.initial_insects_counts():
+            self._add(
+                simulation,
+                STATE_CODES[state],
+                np.array([patch]),
+                np.array([is_male]),
+                np.array([number]),
+            )
+        self.cohorts.merge()
+
+        self.write_counts(
+            simulation,
+            self.patch_counts(simulation.simulation_config.numbers_of_patches),
+            self.dead_counts
+        )
+
+    def update(self, simulation: 'Simulation') -> None:
+        cohorts = self.cohorts
+        profiler = simulation.profiler
+
+        dead_before = self.dead_counts.sum()
+
+        self._migrate(simulation)
+        profiler.tick('migration')
+
+        cohorts.remaining -= 1
+        cohorts.next_cycle = np.maximum(cohorts.next_cycle - 1, 0)
+        previous_state = cohorts.state.copy()
+        due = cohorts.remaining <= 0
+
+        self._transition(simulation, previous_state, due)
+        profiler.tick('aging')
+        self._mate(simulation, np.flatnonzero(previous_state == FF))
+        profiler.tick('mating')
+        self._reproduce(simulation, np.flatnonzero((previous_state == MF) & ~due))
+        profiler.tick('reproduction')
+        self._release(simulation)
+        profiler.tick('release')
+
+        profiler.count('killed', self.dead_counts.sum() - dead_before)
+        cohorts.merge()
+
+        self.write_counts(
+            simulation,
+            self.patch_counts(simulation.simulation_config.numbers_of_patches),
+            self.dead_counts
+        )
+        profiler.tick('bookkeeping')
+
+    def patch_counts(self, numbers_of_patches: int) -> np.ndarray:
+        """
+        :return: (numbers_of_patches, len(StateNames)) array of living insects
+        """
+        cohorts = self.cohorts
+        return np.bincount(
+            cohorts.patch.astype(np.int64) * len(StateNames) + cohorts.state,
+            weights=cohorts.count,
+            minlength=numbers_of_patches * len(StateNames)
+        ).astype(np.int64).reshape(numbers_of_patches, len(StateNames))
+
+    def _tabulate_delays(self, config: InsectConfig) -> Dict[str, DelayDistribution]:
+        delays = {
+            name: DelayDistribution.fresh(config, field)
+            for name, field in DELAY_FIELDS.items()
+        }
+        delays['carried_female_lifespan'] = DelayDistribution.carried(config, 'female_lifespan')
+        delays['female_mate_next_cycle'] = DelayDistribution.ceiling(
+            config, 'female_mate_next_cycle'
+        )
+        return delays
+
+    def _migrate(self, simulation: 'Simulation') -> None:
+        cohorts = self.cohorts
+        adults = np.flatnonzero(np.isin(cohorts.state, ADULT_CODES))
+        if not adults.size:
+            return
+
+        parts, new_patches, counts = simulation.spatial_manager.migrate_counts(
+            cohorts.patch[adults], cohorts.count[adults]
+        )
+        rows = cohorts.rows(adults[parts])
+        rows['patch'] = new_patches
+        rows['count'] = counts
+
+        cohorts.count[adults] = 0
+        cohorts.append(len(parts), **rows)
+
+    def _transition(
+            self,
+            simulation: 'Simulation',
+            previous_state: np.ndarray,
+            due: np.ndarray
+    ) -> None:
+        """Transition of every due cohort but fertile females, see _mate."""
+        rng = simulation.random_streams.engine
+        cohorts = self.cohorts
+
+        def take_due(state: int):
+            rows = np.flatnonzero(due & (previous_state == state))
+            counts = cohorts.count[rows].copy()
+            cohorts.count[rows] = 0
+            return cohorts.patch[rows], cohorts.is_male[rows], counts
+
+        for state, next_state in ((EGG, LARVA), (LARVA, PUPA)):
+            patches, is_male, counts = take_due(state)
+            survivors = rng.binomial(counts, self.survival[state])
+            self._add(simulation, next_state, patches, is_male, survivors)
+            self._kill(patches, counts - survivors)
+
+        patches, is_male, counts = take_due(PUPA)
+        survivors = rng.binomial(counts, self.survival[PUPA])
+        # same sex mapping as PupaState.transition
+        self._add(simulation, YF, patches[is_male], is_male[is_male], survivors[is_male])
+        self._add(simulation, WM, patches[~is_male], is_male[~is_male], survivors[~is_male])
+        self._kill(patches, counts - survivors)
+
+        for state in (WM, SM, MF, SF):
+            patches, _, counts = take_due(state)
+            self._kill(patches, counts)
+
+        patches, is_male, counts = take_due(YF)
+        self._add(simulation, FF, patches, is_male, counts, carried=True)
+
+    def _mate(self, simulation: 'Simulation', rows: np.ndarray) -> None:
+        """
+        Mating of the cohorts that were fertile females at the start of the
+        day. As in FertileFemaleState.update, the due ones get a mating draw
+        before dying.
+        """
+        cohorts = self.cohorts
+        rng = simulation.spatial_manager.rng
+        mating_rates = np.asarray(simulation.simulation_config.mating_rates)
+        patches = cohorts.patch[rows]
+
+        counts = self.patch_counts(len(mating_rates))
+        wm_number = counts[patches, WM]
+        sm_number = counts[patches, SM]
+        competitiveness = simulation.insect_config.sterile_male_competitiveness
+        males = wm_number + competitiveness * sm_number
+        fertile_probability = np.divide(
+            wm_number, males, out=np.zeros(len(rows)), where=males > 0
+        )
+
+        mated = rng.binomial(cohorts.count[rows], mating_rates[patches])
+        fertile = rng.binomial(mated, fertile_probability)
+        remaining = np.maximum(cohorts.remaining[rows], 0)
+        is_male = cohorts.is_male[rows]
+
+        cohorts.count[rows] -= mated
+        dying = cohorts.remaining[rows] <= 0
+        self._kill(patches[dying], cohorts.count[rows[dying]])
+        cohorts.count[rows[dying]] = 0
+
+        self._add(
+            simulation, MF, patches, is_male, fertile,
+            remaining=remaining, carried=True
+        )
+        self._add(
+            simulation, SF, patches, is_male, mated - fertile,
+            remaining=np.maximum(remaining, 1)
+        )
+
+    def _reproduce(self, simulation: 'Simulation', rows: np.ndarray) -> None:
+        config = simulation.insect_config
+        cohorts = self.cohorts
+        capacities = np.asarray(simulation.simulation_config.capacities)
+
+        rows = rows[(cohorts.next_cycle[rows] <= 0) & (cohorts.count[rows] > 0)]
+        if not rows.size:
+            return
+
+        females = cohorts.count[rows]
+        patches = np.repeat(cohorts.patch[rows], females)
+        nb_male_eggs = np.bincount(
+            patches, weights=np.floor(config.eggs_male_count(size=len(patches))),
+            minlength=len(capacities)
+        )
+        nb_female_eggs = np.bincount(
+            patches, weights=np.floor(config.eggs_female_count(size=len(patches))),
+            minlength=len(capacities)
+        )
+
+        max_eggs = np.maximum(0, capacities - self.patch_counts(len(capacities))[:, EGG])
+        laid = nb_male_eggs + nb_female_eggs
+        k = np.minimum(np.divide(max_eggs, laid, out=np.ones(len(laid)), where=laid > 0), 1)
+
+        laying = cohorts.rows(rows)
+        cohorts.count[rows] = 0
+        parts, delays, counts = self.delays['female_mate_next_cycle'].split(
+            laying['count'], simulation.random_streams.engine
+        )
+        laying = {name: column[parts] for name, column in laying.items()}
+        laying['next_cycle'] = delays
+        laying['count'] = counts
+        cohorts.append(len(parts), **laying)
+
+        all_patches = np.arange(len(capacities))
+        nb_male_eggs = (nb_male_eggs * k).astype(np.int64)
+        nb_female_eggs = (nb_female_eggs * k).astype(np.int64)
+        simulation.profiler.count('created', nb_male_eggs.sum() + nb_female_eggs.sum())
+        self._add(simulation, EGG, all_patches, True, nb_male_eggs)
+        self._add(simulation, EGG, all_patches, False, nb_female_eggs)
+
+    def _release(self, simulation: 'Simulation') -> None:
+        numbers_of_patches = simulation.simulation_config.numbers_of_patches
+        counts = simulation.release_strategy.numbers_of_insects(
+            simulation.current_day, numbers_of_patches
+        )
+        simulation.profiler.count('created', counts.sum())
+        simulation.profiler.count('released', counts.sum())
+        self._add(simulation, SM, np.arange(numbers_of_patches), True, counts)
+
+    def _add(
+            self,
+            simulation: 'Simulation',
+            state: int,
+            patches: np.ndarray,
+            is_male,
+            counts: np.ndarray,
+            remaining=0,
+            carried: bool = False
+    ) -> None:
+        """
+        Add cohorts entering ``state``, split by the number of days they will
+        stay in it.
+
+        :param remaining: days left of the previous state carried over
+        :param carried: whether a female lifespan is added to ``remaining``
+            rather than drawn afresh
+        """
+        counts = np.asarray(counts)
+        size = len(counts)
+        patches = np.broadcast_to(patches, size)
+        is_male = np.broadcast_to(is_male, size)
+        remaining = np.broadcast_to(remaining, size)
+        rng = simulation.random_streams.engine
+
+        if state in (FF, MF):
+            lifespan = 'carried_female_lifespan' if carried else 'female_lifespan'
+            parts, delays, part_counts = self.delays[lifespan].split(counts, rng)
+        elif state == SF:
+            parts, delays, part_counts = np.arange(size), np.zeros(size, np.int64), counts
+        else:
+            parts, delays, part_counts = (
+                self.delays[STATE_DELAYS[state]].split(counts, rng)
+            )
+        part_remaining = np.maximum(remaining[parts] + delays, 1)
+
+        next_cycle = np.zeros(len(parts), dtype=np.int64)
+        if state == MF:
+            cycle_parts, next_cycle, cycle_counts = (
+                self.delays['female_mate_next_cycle'].split(part_counts, rng)
+            )
+            parts, part_remaining, part_counts = (
+                parts[cycle_parts], part_remaining[cycle_parts], cycle_counts
+            )
+
+        keep = part_counts > 0
+        self.cohorts.append(
+            int(np.count_nonzero(keep)),
+            state=state,
+            patch=patches[parts][keep],
+            is_male=is_male[parts][keep],
+            remaining=part_remaining[keep],
+            next_cycle=next_cycle[keep],
+            count=part_counts[keep],
+        )
+
+    def _kill(self, patches: np.ndarray, counts: np.ndarray) -> None:
+        np.add.at(self.dead_counts, patches, counts)
+
+
+# InsectConfig (distribution, parameters) fields of each fresh delay table
+DELAY_FIELDS = {
+    'egg_duration': 'egg_duration',
+    'larva_duration': 'larva_duration',
+    'pupa_duration': 'pupa_duration',
+    'wild_male_lifespan': 'wild_male_lifespan',
+    'sterile_male_lifespan': 'sterile_male_lifespan',
+    'female_first_blood_meal': 'female_first_blood',
+    'female_lifespan': 'female_lifespan',
+}
+
+# delay table of the duration drawn by each state's on_enter
+STATE_DELAYS = {
+    EGG: 'egg_duration',
+    LARVA: 'larva_duration',
+    PUPA: 'pupa_duration',
+    WM: 'wild_male_lifespan',
+    SM: 'sterile_male_lifespan',
+    YF: 'female_first_blood_meal',
+}
+
+
+def _bernoulli_parameter(distribution: ProbabilityDistribution, params) -> float:
+    if distribution != ProbabilityDistribution.BERNOULLI:
+        raise ValueError(
+            f"Cohort engine needs bernoulli survival, got {distribution}"
+        )
+    return params[0]
@@ -0,0 +1,45 @@
+import numpy as np
+
+from sit_simulation.engines.insect_table import InsectTable
+
+
+class CohortTable(InsectTable):
+    """
+    InsectTable whose rows are cohorts: ``count`` insects sharing a state, sex,
+    patch and whole number of days left before their transition
+    (``remaining``) and, for mated females, before their next clutch
+    (``next_cycle``).
+    """
+
+    COLUMNS = {
+        'state': np.int8,
+        'is_male': np.bool_,
+        'patch': np.int32,
+        'remaining': np.int32,
+        'next_cycle': np.int32,
+        'count': np.int64,
+    }
+
+    def merge(self) -> None:
+        """Drop empty cohorts and merge the ones sharing every other column."""
+        self.compact(self.count > 0)
+        if not self.size:
+            return
+
+        columns = [self.state, self.is_male, self.patch, self.remaining, self.next_cycle]
+        shape = tuple(int(column.max()) + 1 for column in columns)
+        keys = np.ravel_multi_index(columns, shape)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, weights=self.count)
+        state, is_male, patch, remaining, next_cycle = np.unravel_index(unique_keys, shape)
+
+        self.size = 0
+        self.append(
+            len(unique_keys),
+            state=state,
+            is_male=is_male.astype(bool),
+            patch=patch,
+            remaining=remaining,
+            next_cycle=next_cycle,
+            count=counts.astype(np.int64),
+        )
@@ -0,0 +1,94 @@
+from typing import Tuple
+
+import numpy as np
+
+from sit_simulation.core.config import InsectConfig
+
+# probability left out of the tabulated delays
+TAIL = 1e-9
+# points of the quadrature over the fraction of day carried by females
+CARRIED_FRACTIONS = 64
+
+
+class DelayDistribution:
+    """
+    Distribution of a whole number of days, used to split cohorts. The
+    constructors taking an InsectConfig field (the prefix of its ``_dist``
+    and ``_param`` attributes) compute it exactly from the cumulative
+    distribution of the variates, see InsectConfig.cdf.
+    """
+
+    def __init__(self, pmf: np.ndarray) -> None:
+        """
+        :param pmf: probability of each number of days, from 0
+        """
+        self.pmf = pmf
+
+    @classmethod
+    def fresh(cls, config: InsectConfig, field: str) -> 'DelayDistribution':
+        """
+        Distribution of ``floor(duration) + 1``, the days before a fresh
+        duration is over (see InsectState.update), at least one.
+        """
+        days = np.arange(cls.support(config, field) + 1, dtype=np.float64)
+        pmf = np.diff(cls.below(config, field, days), prepend=0)
+        pmf[1] += pmf[0]
+        pmf[0] = 0
+        return cls(pmf)
+
+    @classmethod
+    def carried(cls, config: InsectConfig, field: str) -> 'DelayDistribution':
+        """
+        Distribution of ``floor(fraction + duration)``, the days of a
+        duration added to the fraction of day carried over from the previous
+        state (YoungFemaleState and FertileFemaleState.on_exit), the
+        fraction being taken uniform.
+        """
+        days = np.arange(cls.support(config, field) + 2, dtype=np.float64)
+        fractions = (np.arange(CARRIED_FRACTIONS) + 0.5) / CARRIED_FRACTIONS
+        below = cls.below(config, field, days[None, :] - fractions[:, None]).mean(axis=0)
+        return cls(np.diff(below))
+
+    @classmethod
+    def ceiling(cls, config: InsectConfig, field: str) -> 'DelayDistribution':
+        """Distribution of ``ceil(duration)``, the days before the next clutch."""
+        days = np.arange(cls.support(config, field) + 1, dtype=np.float64)
+        return cls(np.maximum(np.diff(cls.cdf(config, field, days), prepend=0), 0))
+
+    @staticmethod
+    def cdf(config: InsectConfig, field: str, x: np.ndarray) -> np.ndarray:
+        """Cumulative distribution of the variates of ``field``."""
+        return config.cdf(getattr(config, f'{field}_dist'), getattr(config, f'{field}_param'), x)
+
+    @staticmethod
+    def below(config: InsectConfig, field: str, x: np.ndarray) -> np.ndarray:
+        """Probability that a variate of ``field`` is strictly lower than each ``x``."""
+        return DelayDistribution.cdf(config, field, np.nextafter(x, -np.inf))
+
+    @staticmethod
+    def support(config: InsectConfig, field: str) -> int:
+        """First whole number of days above every variate but a TAIL of them."""
+        days = 1
+        while DelayDistribution.cdf(config, field, days) < 1 - TAIL:
+            days *= 2
+        return days + 1
+
+    def split(
+            self,
+            counts: np.ndarray,
+            rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw the delay of every insect of each cohort with one multinomial
+        draw per cohort.
+
+        :param counts: number of insects of each cohort
+        :return: (cohort index, delay, number of insects) of the non-empty parts
+        """
+        if not len(counts):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+
+        parts = rng.multinomial(counts, self.pmf)
+        cohorts, delays = np.nonzero(parts)
+        return cohorts, delays, parts[cohorts, delays]
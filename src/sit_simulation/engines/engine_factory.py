@@ -0,0 +1,36 @@
+from sit_simulation.core.constants import EngineTypes
+from sit_simulation.engines.base_engine import SimulationEngine
+from sit_simulation.engines.cohort_engine import CohortEngine
+from sit_simulation.engines.hybrid_engine import HybridEngine
+from sit_simulation.engines.keyed_engine import KeyedEngine
+from sit_simulation.engines.mean_field_engine import MeanFieldEngine
+from sit_simulation.engines.object_engine import ObjectEngine
+from sit_simulation.engines.sharded_engine import ShardedEngine
+from sit_simulation.engines.vectorized_engine import VectorizedEngine
+
+
+class EngineFactory:
+
+    @staticmethod
+    def create_engine(
+            engine_type: EngineTypes,
+            workers: int = None,
+            agent_threshold: int = None
+    ) -> SimulationEngine:
+        match engine_type:
+            case EngineTypes.OBJECT:
+                return ObjectEngine()
+            case EngineTypes.VECTORIZED:
+                return VectorizedEngine()
+            case EngineTypes.COHORT:
+                return CohortEngine()
+            case EngineTypes.SHARDED:
+                return ShardedEngine(workers)
+            case EngineTypes.MEAN_FIELD:
+                return MeanFieldEngine()
+            case EngineTypes.HYBRID:
+                return HybridEngine(agent_threshold)
+            case EngineTypes.KEYED:
+                return KeyedEngine()
+            case _:
+                raise ValueError(f"Unknown engine type: {engine_type}")
@@ -0,0 +1,180 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.constants import STATE_CODES, StateNames
+from sit_simulation.engines.cohort_engine import CohortEngine
+from sit_simulation.engines.vectorized_engine import VectorizedEngine
+
+if TYPE_CHECKING:
+    from sit_simulation.core.initial_insects import InitialInsects
+    from sit_simulation.core.simulation import Simulation
+
+FF = STATE_CODES[StateNames.FF]
+MF = STATE_CODES[StateNames.MF]
+DEAD = STATE_CODES[StateNames.DEAD]
+
+
+class HybridEngine(CohortEngine):
+    """
+    Cohort engine whose small sub-populations are simulated insect by insect.
+
+    The insects of a patch and state are held either as cohorts, advanced by
+    the binomial draws of the cohort engine, or as individual insects,
+    advanced by the rules of the vectorized engine with their exact
+    durations. A patch and state switches to individual insects when it
+    holds fewer than ``agent_threshold`` insects, and back to cohorts once it
+    holds twice as many, so that it does not switch every day around the
+    threshold. Both sides see each other's insects when mating and laying.
+    """
+
+    AGENT_THRESHOLD = 100
+
+    def __init__(self, agent_threshold: int = None) -> None:
+        """
+        :param agent_threshold: number of insects of a patch and state below
+            which they are simulated individually, AGENT_THRESHOLD by default
+        """
+        super().__init__()
+        self.agent_threshold = agent_threshold or self.AGENT_THRESHOLD
+        self.agents = _Agents(self)
+        # (numbers_of_patches, len(StateNames)) whether held as individual insects
+        self.individual = np.zeros((0, len(StateNames)), dtype=bool)
+
+    def populate(
+            self,
+            simulation: 'Simulation',
+            initial_insects: 'InitialInsects'
+    ) -> None:
+        numbers_of_patches = simulation.simulation_config.numbers_of_patches
+        self.agents = _Agents(self)
+        self.individual = np.zeros((numbers_of_patches, len(StateNames)), dtype=bool)
+        super().populate(simulation, initial_insects)
+
+        self._rebalance(simulation)
+        self.cohorts.merge()
+        self.write_counts(simulation, self.patch_counts(numbers_of_patches), self.dead_counts)
+
+    def update(self, simulation: 'Simulation') -> None:
+        cohorts = self.cohorts
+        insects = self.agents.insects
+        profiler = simulation.profiler
+        numbers_of_patches = simulation.simulation_config.numbers_of_patches
+
+        dead_before = self.dead_counts.sum()
+
+        self._migrate(simulation)
+        self.agents._migrate(simulation)
+        profiler.tick('migration')
+
+        cohorts.remaining -= 1
+        cohorts.next_cycle = np.maximum(cohorts.next_cycle - 1, 0)
+        previous_state = cohorts.state.copy()
+        due = cohorts.remaining <= 0
+        agents_previous_state = insects.state.copy()
+        insects.age += 1
+
+        self._transition(simulation, previous_state, due)
+        self.agents._transition(
+            simulation, agents_previous_state, insects.age > insects.duration
+        )
+        profiler.tick('aging')
+        self._mate(simulation, np.flatnonzero(previous_state == FF))
+        self.agents._mate(simulation, np.flatnonzero(agents_previous_state == FF))
+        profiler.tick('mating')
+        self._reproduce(simulation, np.flatnonzero((previous_state == MF) & ~due))
+        self.agents._reproduce(simulation)
+        profiler.tick('reproduction')
+        self._release(simulation)
+        profiler.tick('release')
+
+        dead = insects.state == DEAD
+        self.dead_counts += np.bincount(insects.patch[dead], minlength=numbers_of_patches)
+        insects.compact(~dead)
+        profiler.count('killed', self.dead_counts.sum() - dead_before)
+
+        self._rebalance(simulation)
+        cohorts.merge()
+
+        self.write_counts(simulation, self.patch_counts(numbers_of_patches), self.dead_counts)
+        profiler.tick('bookkeeping')
+
+    def patch_counts(self, numbers_of_patches: int) -> np.ndarray:
+        """
+        :return: (numbers_of_patches, len(StateNames)) array of living
+            insects, cohorts and individual insects together
+        """
+        return (
+            super().patch_counts(numbers_of_patches)
+            + self.agents.own_patch_counts(numbers_of_patches)
+        )
+
+    def _rebalance(self, simulation: 'Simulation') -> None:
+        """
+        Update which patches and states are held as individual insects, and
+        move the insects held the other way.
+
+        Individual insects leaving their state in ``k`` days join the cohort
+        with ``k`` days remaining, losing the fraction of day they carry.
+        Insects taken out of a cohort draw that fraction uniformly, as the
+        cohort engine does for the lifespans it carries over.
+        """
+        cohorts = self.cohorts
+        insects = self.agents.insects
+
+        totals = self.patch_counts(len(self.individual))
+        self.individual |= totals < self.agent_threshold
+        self.individual &= totals < 2 * self.agent_threshold
+
+        to_cohorts = ~self.individual[insects.patch, insects.state]
+        rows = np.flatnonzero(to_cohorts)
+        if rows.size:
+            age = insects.age[rows]
+            state = insects.state[rows]
+            cohorts.append(
+                rows.size,
+                state=state,
+                is_male=insects.is_male[rows],
+                patch=insects.patch[rows],
+                remaining=np.maximum(np.floor(insects.duration[rows] - age) + 1, 1),
+                next_cycle=np.where(
+                    state == MF, np.maximum(np.ceil(insects.next_cycle[rows] - age), 0), 0
+                ),
+                count=1,
+            )
+            insects.compact(~to_cohorts)
+
+        rows = np.flatnonzero(
+            (cohorts.count > 0) & self.individual[cohorts.patch, cohorts.state]
+        )
+        if rows.size:
+            counts = cohorts.count[rows]
+            rows = np.repeat(rows, counts)
+            insects.append(
+                rows.size,
+                state=cohorts.state[rows],
+                is_male=cohorts.is_male[rows],
+                patch=cohorts.patch[rows],
+                duration=cohorts.remaining[rows] - 1
+                + simulation.random_streams.engine.random(rows.size),
+                next_cycle=cohorts.next_cycle[rows],
+            )
+            cohorts.count[np.unique(rows)] = 0
+
+
+class _Agents(VectorizedEngine):
+    """
+    Individual insects of a HybridEngine, mating and laying among the insects
+    of both sides.
+    """
+
+    def __init__(self, hybrid: HybridEngine) -> None:
+        super().__init__()
+        self.hybrid = hybrid
+
+    def patch_counts(self, numbers_of_patches: int) -> np.ndarray:
+        return self.hybrid.patch_counts(numbers_of_patches)
+
+    def own_patch_counts(self, numbers_of_patches: int) -> np.ndarray:
+        """:return: (numbers_of_patches, len(StateNames)) individual insects"""
+        return super().patch_counts(numbers_of_patches)
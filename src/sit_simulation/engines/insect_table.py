@@ -0,0 +1,87 @@
+from typing import Dict
+
+import numpy as np
+
+
+class InsectTable:
+    """
+    Structure-of-arrays storage of insects: one NumPy column per attribute of
+    Insect, rows ``[0, size)`` being the living insects. Columns are exposed as
+    attributes returning views, so ``table.age += 1`` updates in place.
+    """
+
+    COLUMNS = {
+        'state': np.int8,
+        'is_male': np.bool_,
+        'patch': np.int32,
+        'age': np.int32,
+        'duration': np.float64,
+        'next_cycle': np.float64,
+        'nb_cycles': np.int16,
+    }
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.size = 0
+        self._data = {
+            name: np.zeros(capacity, dtype=dtype)
+            for name, dtype in self.COLUMNS.items()
+        }
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        data = self.__dict__.get('_data')
+        if data is None or name not in data:
+            raise AttributeError(name)
+        return data[name][:self.size]
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in self.COLUMNS:
+            self._data[name][:self.size] = value
+        else:
+            super().__setattr__(name, value)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data['state'])
+
+    def append(self, number: int, **columns) -> None:
+        """
+        Add ``number`` rows; columns not given are zero-filled.
+
+        :param number: number of insects to add
+        :param columns: scalar or array of length ``number`` per column
+        """
+        if number <= 0:
+            return
+
+        self._reserve(self.size + number)
+        new_rows = slice(self.size, self.size + number)
+        for name, data in self._data.items():
+            data[new_rows] = columns.get(name, 0)
+        self.size += number
+
+    def compact(self, keep: np.ndarray) -> None:
+        """Drop every row where ``keep`` is False, preserving row order."""
+        kept = int(np.count_nonzero(keep))
+        for data in self._data.values():
+            data[:kept] = data[:self.size][keep]
+        self.size = kept
+
+    def rows(self, mask: np.ndarray) -> Dict[str, np.ndarray]:
+        """Copy of the selected rows, as accepted by ``append``."""
+        return {
+            name: data[:self.size][mask]
+            for name, data in self._data.items()
+        }
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= self.capacity:
+            return
+
+        new_capacity = max(capacity, 2 * self.capacity)
+        for name, data in self._data.items():
+            grown = np.zeros(new_capacity, dtype=data.dtype)
+            grown[:self.size] = data[:self.size]
+            self._data[name] = grown
@@ -0,0 +1,157 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.config import InsectConfig
+from sit_simulation.core.constants import STATE_CODES, ProbabilityDistribution, StateNames
+from sit_simulation.core.keyed_random import KeyedRandom
+from sit_simulation.engines.keyed_insect_table import KeyedInsectTable
+from sit_simulation.engines.vectorized_engine import VectorizedEngine
+
+if TYPE_CHECKING:
+    from sit_simulation.core.initial_insects import InitialInsects
+    from sit_simulation.core.random_streams import RandomStreams
+    from sit_simulation.core.simulation import Simulation
+
+EGG = STATE_CODES[StateNames.EGG]
+
+# InsectConfig (distribution, parameters) fields of each sampler
+SAMPLER_FIELDS = {
+    'egg_duration': 'egg_duration',
+    'egg_survive': 'egg_survive',
+    'larva_duration': 'larva_duration',
+    'larva_survive': 'larva_survive',
+    'pupa_duration': 'pupa_duration',
+    'pupa_survive': 'pupa_survive',
+    'wild_male_lifespan': 'wild_male_lifespan',
+    'sterile_male_lifespan': 'sterile_male_lifespan',
+    'female_lifespan': 'female_lifespan',
+    'female_mate_next_cycle': 'female_mate_next_cycle',
+    'eggs_male_count': 'eggs_male',
+    'eggs_female_count': 'eggs_female',
+    'female_first_blood_meal': 'female_first_blood',
+}
+
+# field of the random numbers telling apart the events of an insect on a day
+EVENTS = {
+    event: code
+    for code, event in enumerate(
+        (*SAMPLER_FIELDS, 'mating', 'fertility', 'migration', 'created')
+    )
+}
+
+
+class KeyedEngine(VectorizedEngine):
+    """
+    Vectorized engine drawing common random numbers: every random number of
+    an insect is keyed by the insect, the day and the event it decides (see
+    KeyedRandom), instead of being the next number of a stream.
+
+    Eggs are keyed by their mother, the day and their rank in the clutch,
+    and the other insects by the day and order of their creation. Two runs
+    with the same seed that only differ by their release strategy thus give
+    the same fate to every wild insect until the sterile males change it,
+    through a sterile mating, or through the egg capacity and the insects
+    that follow from it. Their difference then has much less noise than
+    that of independent runs.
+    """
+
+    TABLE = KeyedInsectTable
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.keyed_random: KeyedRandom = None
+        # streams the keys were seeded from
+        self.random_streams: 'RandomStreams' = None
+        # insects created today without a mother
+        self.created = 0
+
+    def populate(
+            self,
+            simulation: 'Simulation',
+            initial_insects: 'InitialInsects'
+    ) -> None:
+        self._seed(simulation)
+        self.created = 0
+        super().populate(simulation, initial_insects)
+
+    def update(self, simulation: 'Simulation') -> None:
+        if simulation.random_streams is not self.random_streams:
+            # new streams, e.g. of a fork, see Simulation.set_random_streams
+            self._seed(simulation)
+        self.created = 0
+        super().update(simulation)
+
+    def _seed(self, simulation: 'Simulation') -> None:
+        self.random_streams = simulation.random_streams
+        self.keyed_random = KeyedRandom(self.random_streams.engine.integers(2 ** 63))
+
+    def _lay(
+            self,
+            simulation: 'Simulation',
+            rows: np.ndarray,
+            nb_male_eggs: np.ndarray,
+            nb_female_eggs: np.ndarray
+    ) -> None:
+        insects = self.insects
+        for nb_eggs, is_male, event in (
+                (nb_male_eggs, True, 'eggs_male_count'),
+                (nb_female_eggs, False, 'eggs_female_count'),
+        ):
+            mothers = np.repeat(rows, nb_eggs)
+            ranks = np.arange(len(mothers)) - np.repeat(np.cumsum(nb_eggs) - nb_eggs, nb_eggs)
+            keys = self.keyed_random.keys(
+                insects.key[mothers], simulation.current_day, EVENTS[event], ranks
+            )
+            self._add(
+                simulation, EGG, len(mothers), insects.patch[mothers], is_male, key=keys
+            )
+
+    def _add(
+            self,
+            simulation: 'Simulation',
+            state: int,
+            number: int,
+            patch,
+            is_male,
+            **columns
+    ) -> None:
+        number = int(number)
+        if 'key' not in columns and number > 0:
+            columns['key'] = self.keyed_random.keys(
+                simulation.current_day, EVENTS['created'], self.created + np.arange(number)
+            )
+            self.created += number
+        super()._add(simulation, state, number, patch, is_male, **columns)
+
+    def _sample(self, simulation: 'Simulation', sampler: str, rows: np.ndarray) -> np.ndarray:
+        config = simulation.insect_config
+        field = SAMPLER_FIELDS[sampler]
+        distribution = getattr(config, f'{field}_dist')
+        draws = 2 if distribution == ProbabilityDistribution.NORMAL else 1
+        return InsectConfig.from_uniforms(
+            distribution,
+            getattr(config, f'{field}_param'),
+            self._uniforms(simulation, sampler, rows, draws),
+        )
+
+    def _random(self, simulation: 'Simulation', event: str, rows: np.ndarray) -> np.ndarray:
+        return self._uniforms(simulation, event, rows)[0]
+
+    def _random_patches(self, simulation: 'Simulation', rows: np.ndarray) -> np.ndarray:
+        return simulation.spatial_manager.migration_matrix.sample(
+            self.insects.patch[rows], self._random(simulation, 'migration', rows)
+        )
+
+    def _uniforms(
+            self,
+            simulation: 'Simulation',
+            event: str,
+            rows: np.ndarray,
+            draws: int = 1
+    ) -> np.ndarray:
+        """:return: (draws, len(rows)) numbers in [0, 1) of ``event`` today"""
+        return self.keyed_random.uniforms(
+            self.insects.key[rows], simulation.current_day, EVENTS[event],
+            np.arange(draws)[:, None]
+        )
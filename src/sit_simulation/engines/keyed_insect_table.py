@@ -0,0 +1,15 @@
+import numpy as np
+
+from sit_simulation.engines.insect_table import InsectTable
+
+
+class KeyedInsectTable(InsectTable):
+    """
+    InsectTable whose rows also hold the ``key`` naming each insect in the
+    counter-based random numbers of KeyedEngine.
+    """
+
+    COLUMNS = {
+        **InsectTable.COLUMNS,
+        'key': np.uint64,
+    }
@@ -0,0 +1,317 @@
+from typing import Dict, TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.config import InsectConfig
+from sit_simulation.core.constants import STATE_CODES, StateNames
+from sit_simulation.engines.base_engine import SimulationEngine
+from sit_simulation.engines.delay_distribution import DelayDistribution
+
+if TYPE_CHECKING:
+    from sit_simulation.core.initial_insects import InitialInsects
+    from sit_simulation.core.simulation import Simulation
+
+EGG = STATE_CODES[StateNames.EGG]
+LARVA = STATE_CODES[StateNames.LARVA]
+PUPA = STATE_CODES[StateNames.PUPA]
+WM = STATE_CODES[StateNames.WM]
+SM = STATE_CODES[StateNames.SM]
+YF = STATE_CODES[StateNames.YF]
+FF = STATE_CODES[StateNames.FF]
+MF = STATE_CODES[StateNames.MF]
+SF = STATE_CODES[StateNames.SF]
+
+IMMATURE_CODES = (EGG, LARVA, PUPA)
+# adults but mated females, whose clutches add a dimension
+ADULT_CODES = (WM, SM, YF, FF, SF)
+
+# InsectConfig (distribution, parameters) fields of the duration set by each
+# state's on_enter
+DURATION_FIELDS = {
+    EGG: 'egg_duration',
+    LARVA: 'larva_duration',
+    PUPA: 'pupa_duration',
+    WM: 'wild_male_lifespan',
+    SM: 'sterile_male_lifespan',
+    YF: 'female_first_blood',
+    FF: 'female_lifespan',
+    MF: 'female_lifespan',
+}
+SURVIVAL_FIELDS = {EGG: 'egg_survive', LARVA: 'larva_survive', PUPA: 'pupa_survive'}
+
+
+class MeanFieldEngine(SimulationEngine):
+    """
+    Deterministic counterpart of the cohort engine: the expected numbers of
+    insects per patch, state and whole number of days left in the state are
+    advanced by the difference equations the stochastic rules average to.
+    Survival, mating, laying and migration move expected fractions of the
+    insects instead of drawn numbers, and durations are spread over the days
+    by their exact distributions in the insect configuration, so a run does
+    not depend on the seed.
+
+    Eggs, larvae and pupae are kept per sex, mated females per day left
+    before their next clutch as well. Counts are rounded to whole insects
+    when written to the spatial manager.
+    """
+
+    def __init__(self) -> None:
+        # (2, numbers_of_patches, days) eggs, larvae and pupae by sex, the
+        # last index being the number of days left, 0 once due
+        self.immatures: Dict[int, np.ndarray] = {}
+        # (numbers_of_patches, days) other adults
+        self.adults: Dict[int, np.ndarray] = {}
+        # (numbers_of_patches, days, days before the next clutch)
+        self.mated = np.zeros((0, 0, 0))
+        self.dead = np.zeros(0)
+
+        self.delays: Dict[int, np.ndarray] = {}
+        self.survival: Dict[int, float] = {}
+        self.carried: np.ndarray = None
+        self.next_cycle: np.ndarray = None
+        self.eggs_per_clutch = (0.0, 0.0)
+
+    def populate(
+            self,
+            simulation: 'Simulation',
+            initial_insects: 'InitialInsects'
+    ) -> None:
+        config = simulation.insect_config
+        numbers_of_patches = simulation.simulation_config.numbers_of_patches
+
+        self.delays = {
+            state: DelayDistribution.fresh(config, field).pmf
+            for state, field in DURATION_FIELDS.items()
+        }
+        carried = DelayDistribution.carried(config, 'female_lifespan').pmf
+        self.next_cycle = DelayDistribution.ceiling(config, 'female_mate_next_cycle').pmf
+        days = 2 * max(len(carried), *(len(delay) for delay in self.delays.values()))
+        self.delays = {state: _fit(delay, days) for state, delay in self.delays.items()}
+        self.carried = _shift_matrix(carried, days)
+
+        self.survival = {
+            state: 1 - _probability_of_zero(config, field)
+            for state, field in SURVIVAL_FIELDS.items()
+        }
+        self.eggs_per_clutch = (
+            _expected_floor(config, 'eggs_male'), _expected_floor(config, 'eggs_female')
+        )
+
+        self.immatures = {
+            state: np.zeros((2, numbers_of_patches, days)) for state in IMMATURE_CODES
+        }
+        self.adults = {
+            state: np.zeros((numbers_of_patches, days)) for state in ADULT_CODES
+        }
+        self.mated = np.zeros((numbers_of_patches, days, len(self.next_cycle)))
+        self.dead = np.zeros(numbers_of_patches)
+
+        for patch, is_male, state, number in initial_insects.initial_insects_counts():
+            code = STATE_CODES[state]
+            if code in IMMATURE_CODES:
+                self.immatures[code][int(is_male), patch] += number * self.delays[code]
+            elif code == MF:
+                self.mated[patch] += number * np.outer(self.delays[MF], self.next_cycle)
+            elif code == SF:
+                # no duration of its own, as SterileFemaleState.on_enter
+                self.adults[SF][patch, 1] += number
+            elif code in ADULT_CODES:
+                self.adults[code][patch] += number * self.delays[code]
+            else:
+                self.dead[patch] += number
+
+        self.write_counts(simulation, self.patch_counts(), np.rint(self.dead))
+
+    def update(self, simulation: 'Simulation') -> None:
+        profiler = simulation.profiler
+        dead_before = self.dead.sum()
+
+        self._migrate(simulation)
+        profiler.tick('migration')
+
+        due = self._age()
+        fertile = self._transition(due)
+        # females mated from today on lay from tomorrow
+        laying = self.mated[..., 0].copy()
+        profiler.tick('aging')
+        self._mate(simulation)
+        # and young females turned fertile today look for a mate from tomorrow
+        self.adults[FF] += fertile
+        profiler.tick('mating')
+        self._reproduce(simulation, laying)
+        profiler.tick('reproduction')
+        self._release(simulation)
+        profiler.tick('release')
+
+        profiler.count('killed', self.dead.sum() - dead_before)
+        self.write_counts(simulation, self.patch_counts(), np.rint(self.dead))
+        profiler.tick('bookkeeping')
+
+    def patch_counts(self) -> np.ndarray:
+        """
+        :return: (numbers_of_patches, len(StateNames)) living insects,
+            rounded to whole insects
+        """
+        counts = np.zeros((len(self.dead), len(StateNames)))
+        for state, densities in self.immatures.items():
+            counts[:, state] = densities.sum(axis=(0, 2))
+        for state, densities in self.adults.items():
+            counts[:, state] = densities.sum(axis=1)
+        counts[:, MF] = self.mated.sum(axis=(1, 2))
+        return np.rint(counts).astype(np.int64)
+
+    def _migrate(self, simulation: 'Simulation') -> None:
+        migration_matrix = simulation.spatial_manager.migration_matrix
+        for state, densities in self.adults.items():
+            self.adults[state] = migration_matrix.spread(densities)
+        self.mated = migration_matrix.spread(self.mated)
+
+    def _age(self) -> Dict[int, np.ndarray]:
+        """
+        Count down a day for every insect, and a day before the next clutch
+        for mated females.
+
+        :return: insects of each state due to leave it today, taken out of
+            it but for fertile females, who still look for a mate first
+        """
+        due = {}
+        for densities in (*self.immatures.values(), *self.adults.values()):
+            densities[..., :-1] = densities[..., 1:]
+            densities[..., -1] = 0
+        self.mated[:, :-1] = self.mated[:, 1:]
+        self.mated[:, -1] = 0
+
+        for state, densities in self.immatures.items():
+            due[state] = densities[..., 0].copy()
+            densities[..., 0] = 0
+        for state, densities in self.adults.items():
+            if state != FF:
+                due[state] = densities[:, 0].copy()
+                densities[:, 0] = 0
+        due[MF] = self.mated[:, 0].sum(axis=1)
+        self.mated[:, 0] = 0
+
+        mated = self.mated
+        mated[..., 0] += mated[..., 1]
+        mated[..., 1:-1] = mated[..., 2:]
+        mated[..., -1] = 0
+        return due
+
+    def _transition(self, due: Dict[int, np.ndarray]) -> np.ndarray:
+        """
+        Transition of the due insects but fertile females, see _mate.
+
+        :return: (numbers_of_patches, days) females turned fertile today
+        """
+        for state, next_state in ((EGG, LARVA), (LARVA, PUPA)):
+            survivors = due[state] * self.survival[state]
+            self.immatures[next_state] += survivors[..., None] * self.delays[next_state]
+            self.dead += (due[state] - survivors).sum(axis=0)
+
+        survivors = due[PUPA] * self.survival[PUPA]
+        # same sex mapping as PupaState.transition
+        self.adults[YF] += survivors[1][:, None] * self.delays[YF]
+        self.adults[WM] += survivors[0][:, None] * self.delays[WM]
+        self.dead += (due[PUPA] - survivors).sum(axis=0)
+
+        for state in (WM, SM, MF, SF):
+            self.dead += due[state]
+
+        return due[YF][:, None] * self.carried[0]
+
+    def _mate(self, simulation: 'Simulation') -> None:
+        """
+        Mating of the fertile females, as in FertileFemaleState: the due ones
+        get a mating chance before dying, mated ones carry the days left of
+        their lifespan and sterile ones die when it ends.
+        """
+        fertile_females = self.adults[FF]
+        mating_rates = np.asarray(simulation.simulation_config.mating_rates)
+        competitiveness = simulation.insect_config.sterile_male_competitiveness
+
+        wm_number = self.adults[WM].sum(axis=1)
+        sm_number = self.adults[SM].sum(axis=1)
+        males = wm_number + competitiveness * sm_number
+        fertile_probability = np.divide(
+            wm_number, males, out=np.zeros_like(males), where=males > 0
+        )
+
+        mated = fertile_females * mating_rates[:, None]
+        fertile = mated * fertile_probability[:, None]
+        sterile = mated - fertile
+        fertile_females -= mated
+
+        self.dead += fertile_females[:, 0]
+        fertile_females[:, 0] = 0
+
+        self.mated += (fertile @ self.carried)[..., None] * self.next_cycle
+        self.adults[SF] += sterile
+        self.adults[SF][:, 1] += self.adults[SF][:, 0]
+        self.adults[SF][:, 0] = 0
+
+    def _reproduce(self, simulation: 'Simulation', laying: np.ndarray) -> None:
+        """
+        Clutch of the mated females whose next cycle came, the eggs being
+        scaled down to the free capacity of their patch.
+
+        :param laying: (numbers_of_patches, days) mated females laying today
+        """
+        capacities = np.asarray(simulation.simulation_config.capacities, dtype=np.float64)
+
+        females = laying.sum(axis=1)
+        eggs_male, eggs_female = self.eggs_per_clutch
+        laid = females * (eggs_male + eggs_female)
+
+        eggs = self.immatures[EGG].sum(axis=(0, 2))
+        max_eggs = np.maximum(0, capacities - eggs)
+        k = np.minimum(np.divide(max_eggs, laid, out=np.ones_like(laid), where=laid > 0), 1)
+
+        self.mated[..., 0] -= laying
+        self.mated += laying[..., None] * self.next_cycle
+
+        created = females * k * (eggs_male + eggs_female)
+        simulation.profiler.count('created', created.sum())
+        self.immatures[EGG][1] += (females * k * eggs_male)[:, None] * self.delays[EGG]
+        self.immatures[EGG][0] += (females * k * eggs_female)[:, None] * self.delays[EGG]
+
+    def _release(self, simulation: 'Simulation') -> None:
+        counts = simulation.release_strategy.numbers_of_insects(
+            simulation.current_day, len(self.dead)
+        )
+        simulation.profiler.count('created', counts.sum())
+        simulation.profiler.count('released', counts.sum())
+        self.adults[SM] += counts[:, None] * self.delays[SM]
+
+
+def _probability_of_zero(config: InsectConfig, field: str) -> float:
+    return float(
+        DelayDistribution.cdf(config, field, 0.0) - DelayDistribution.below(config, field, 0.0)
+    )
+
+
+def _expected_floor(config: InsectConfig, field: str) -> float:
+    """Expected number of eggs of a clutch, ``int`` of a variate."""
+    days = np.arange(1, DelayDistribution.support(config, field) + 1, dtype=np.float64)
+    return float((1 - DelayDistribution.below(config, field, days)).sum())
+
+
+def _fit(pmf: np.ndarray, days: int) -> np.ndarray:
+    """``pmf`` cut or padded to ``days`` values, the cut tail on the last one."""
+    fitted = np.zeros(days)
+    fitted[:min(len(pmf), days)] = pmf[:days]
+    fitted[-1] += pmf[days:].sum()
+    return fitted
+
+
+def _shift_matrix(pmf: np.ndarray, days: int) -> np.ndarray:
+    """
+    (days, days) matrix moving insects with ``d`` days left to ``d + delay``
+    days left, the delay following ``pmf``: at least one day is left and at
+    most ``days - 1``.
+    """
+    left = np.arange(days)
+    matrix = np.zeros((days, days))
+    for delay, probability in enumerate(pmf):
+        if probability:
+            np.add.at(matrix, (left, np.clip(left + delay, 1, days - 1)), probability)
+    return matrix
@@ -0,0 +1,87 @@
+from typing import TYPE_CHECKING
+
+from sit_simulation.core.constants import StateNames
+from sit_simulation.core.insect_manager import InsectManager
+from sit_simulation.engines.base_engine import SimulationEngine
+from sit_simulation.states.fertile_female_state import FertileFemaleState
+
+if TYPE_CHECKING:
+    from sit_simulation.core.initial_insects import InitialInsects
+    from sit_simulation.core.simulation import Simulation
+
+
+class ObjectEngine(SimulationEngine):
+    """
+    One Insect agent per insect, each driven by its InsectState. No insect
+    is visited only to count its age: every day, the adults move, then the
+    insects the InsectManager filed under that day leave their state, the
+    females fertile in the morning look for a mate and the mated females
+    filed under that day lay their eggs.
+
+    When profiled, the moves of the adults are timed together as the
+    ``migration`` phase, and the transitions of the insects by the class of
+    the state they leave, as ``state.<StateClass>`` phases.
+    """
+
+    def __init__(self) -> None:
+        self.insect_manager: InsectManager = None
+
+    def populate(
+            self,
+            simulation: 'Simulation',
+            initial_insects: 'InitialInsects'
+    ) -> None:
+        self.insect_manager = InsectManager(simulation.spatial_manager, simulation.insect_config)
+        self.insect_manager.extend(initial_insects.initial_insects_list(self.insect_manager))
+
+    def update(self, simulation: 'Simulation') -> None:
+        profiler = simulation.profiler
+        insect_manager = self.insect_manager
+        day = simulation.current_day
+        insect_manager.day = day
+        timed = profiler.enabled
+
+        for insect in insect_manager.adults:
+            insect.update()
+        profiler.tick('migration')
+
+        fertile = insect_manager.take_fertile()
+        killed = 0
+        for insect in insect_manager.transitions.pop(day):
+            state = insect.state
+            # also filed under the days of states it has since left
+            if state.state_name is StateNames.DEAD or insect.age <= insect.duration:
+                continue
+            state.transition(insect)
+            if timed:
+                profiler.tick(f'state.{type(state).__name__}')
+            if insect.state.state_name is StateNames.DEAD:
+                killed += 1
+            if not state.is_adult:
+                insect_manager.add(insect)
+        profiler.tick('aging')
+        profiler.count('killed', killed)
+
+        fertile_female = FertileFemaleState()
+        for insect in fertile:
+            # females dying today still mate, as they did when polled
+            fertile_female.mate(insect)
+            if insect.state is fertile_female:
+                insect_manager.fertile.append(insect)
+        profiler.tick('mating')
+
+        created = 0
+        for insect in insect_manager.clutches.pop(day):
+            # only the mated females whose age reached their next cycle lay
+            created += len(insect.reproduce())
+        profiler.tick('reproduction')
+        profiler.count('created', created)
+
+        released = simulation.release_strategy.release(simulation, insect_manager)
+        insect_manager.extend(released)
+        profiler.tick('release')
+        profiler.count('created', len(released))
+        profiler.count('released', len(released))
+
+        insect_manager.compact()
+        profiler.tick('bookkeeping')
@@ -0,0 +1,209 @@
+import multiprocessing
+import os
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.config import InsectConfig, SimulationConfig
+from sit_simulation.core.constants import StateNames
+from sit_simulation.core.release_strategy import ReleaseStrategy
+from sit_simulation.engines.base_engine import SimulationEngine
+from sit_simulation.engines.vectorized_engine import VectorizedEngine
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from sit_simulation.core.initial_insects import InitialInsects
+    from sit_simulation.core.simulation import Simulation
+
+
+class ShardedEngine(SimulationEngine):
+    """
+    Vectorized engine split by patch across worker processes. Patches only
+    interact through migration, so each worker advances a contiguous block of
+    patches on its own and the migrants are exchanged through the parent at
+    a barrier every day. Workers write their counts to a shared-memory array
+    that is copied into the spatial manager after each day.
+    """
+
+    def __init__(self, workers: int = None) -> None:
+        """
+        :param workers: number of processes, one per CPU by default
+        """
+        self.workers = workers or os.cpu_count()
+        self.bounds = np.zeros(0, dtype=np.int64)
+        self._processes: List[multiprocessing.Process] = []
+        self._connections: List[Connection] = []
+        self._shared_memory: SharedMemory = None
+        self._shared_counts: np.ndarray = None
+
+    def populate(
+            self,
+            simulation: 'Simulation',
+            initial_insects: 'InitialInsects'
+    ) -> None:
+        numbers_of_patches = simulation.simulation_config.numbers_of_patches
+        shards = min(self.workers, numbers_of_patches)
+        self.bounds = np.linspace(0, numbers_of_patches, shards + 1).astype(np.int64)
+
+        shape = (numbers_of_patches, len(StateNames))
+        self._shared_memory = SharedMemory(
+            create=True, size=int(np.prod(shape)) * np.dtype(np.int64).itemsize
+        )
+        self._shared_counts = np.ndarray(
+            shape, dtype=np.int64, buffer=self._shared_memory.buf
+        )
+        self._shared_counts[:] = 0
+
+        seed_sequences = simulation.random_streams.spawn(shards)
+        for shard in range(shards):
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_run_shard,
+                args=(
+                    child_connection,
+                    self._shared_memory.name,
+                    shape,
+                    range(self.bounds[shard], self.bounds[shard + 1]),
+                    simulation.insect_config,
+                    simulation.simulation_config,
+                    simulation.release_strategy,
+                    initial_insects.initial_insects,
+                    seed_sequences[shard].seed_sequence,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            self._processes.append(process)
+            self._connections.append(parent_connection)
+
+        for connection in self._connections:
+            connection.recv()
+        simulation.spatial_manager.counts[:] = self._shared_counts
+
+    def update(self, simulation: 'Simulation') -> None:
+        for connection in self._connections:
+            connection.send(('migrate',))
+
+        immigrants: List[List[Dict[str, np.ndarray]]] = [[] for _ in self._connections]
+        for connection in self._connections:
+            emigrants = connection.recv()
+            owners = np.searchsorted(self.bounds, emigrants['patch'], side='right') - 1
+            for owner in np.unique(owners):
+                immigrants[owner].append({
+                    name: column[owners == owner]
+                    for name, column in emigrants.items()
+                })
+
+        # the shards do not profile themselves: only the exchanges are timed
+        simulation.profiler.tick('migration')
+
+        for connection, rows in zip(self._connections, immigrants):
+            connection.send(('advance', simulation.current_day, rows))
+        for connection in self._connections:
+            connection.recv()
+
+        simulation.spatial_manager.counts[:] = self._shared_counts
+        simulation.profiler.tick('advance')
+
+    def __getstate__(self):
+        raise TypeError(
+            "ShardedEngine cannot be checkpointed or forked: its population "
+            "lives in the worker processes"
+        )
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.send(('close',))
+        for process in self._processes:
+            process.join()
+        self._processes, self._connections = [], []
+
+        if self._shared_memory is not None:
+            self._shared_memory.close()
+            self._shared_memory.unlink()
+            self._shared_memory = None
+
+
+class _ShardEngine(VectorizedEngine):
+    """Vectorized engine restricted to one block of patches."""
+
+    def __init__(self, patches: range) -> None:
+        super().__init__()
+        self.patches = patches
+
+    def owned_patches(self, simulation: 'Simulation') -> range:
+        return self.patches
+
+    def emigrate(self, simulation: 'Simulation') -> Dict[str, np.ndarray]:
+        """Migrate the adults and hand over the ones leaving the block."""
+        self._migrate(simulation)
+
+        insects = self.insects
+        leaving = (insects.patch < self.patches.start) | (insects.patch >= self.patches.stop)
+        emigrants = insects.rows(leaving)
+        insects.compact(~leaving)
+        return emigrants
+
+    def immigrate(self, immigrants: List[Dict[str, np.ndarray]]) -> None:
+        for rows in immigrants:
+            self.insects.append(len(rows['state']), **rows)
+
+    def advance(self, simulation: 'Simulation') -> None:
+        self._advance(simulation)
+
+
+def _run_shard(
+        connection: Connection,
+        shared_memory_name: str,
+        shape: tuple,
+        patches: range,
+        insect_config: InsectConfig,
+        simulation_config: SimulationConfig,
+        release_strategy: ReleaseStrategy,
+        initial_insects: 'pd.DataFrame',
+        seed_sequence: np.random.SeedSequence
+) -> None:
+    from sit_simulation.core.initial_insects import InitialInsects
+    from sit_simulation.core.simulation import Simulation
+    from sit_simulation.core.spatial_manager import SpatialManager
+
+    shared_memory = SharedMemory(name=shared_memory_name)
+    shared_counts = np.ndarray(shape, dtype=np.int64, buffer=shared_memory.buf)
+
+    spatial_manager = SpatialManager(insect_config, simulation_config)
+    engine = _ShardEngine(patches)
+    simulation = Simulation(
+        insect_config=insect_config,
+        simulation_config=simulation_config,
+        release_strategy=release_strategy,
+        spatial_manager=spatial_manager,
+        initial_insects=InitialInsects(initial_insects, spatial_manager, insect_config),
+        observers=[],
+        engine=engine,
+        seed=seed_sequence,
+    )
+    shared_counts[patches.start:patches.stop] = spatial_manager.counts[patches.start:patches.stop]
+    connection.send(None)
+
+    while True:
+        message = connection.recv()
+        match message[0]:
+            case 'migrate':
+                connection.send(engine.emigrate(simulation))
+            case 'advance':
+                _, simulation.current_day, immigrants = message
+                engine.immigrate(immigrants)
+                engine.advance(simulation)
+                shared_counts[patches.start:patches.stop] = (
+                    spatial_manager.counts[patches.start:patches.stop]
+                )
+                connection.send(None)
+            case 'close':
+                break
+
+    del shared_counts
+    shared_memory.close()
@@ -0,0 +1,323 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.constants import ADULT_STATES, STATE_CODES, StateNames
+from sit_simulation.engines.base_engine import SimulationEngine
+from sit_simulation.engines.insect_table import InsectTable
+
+if TYPE_CHECKING:
+    from sit_simulation.core.initial_insects import InitialInsects
+    from sit_simulation.core.simulation import Simulation
+
+EGG = STATE_CODES[StateNames.EGG]
+LARVA = STATE_CODES[StateNames.LARVA]
+PUPA = STATE_CODES[StateNames.PUPA]
+WM = STATE_CODES[StateNames.WM]
+SM = STATE_CODES[StateNames.SM]
+YF = STATE_CODES[StateNames.YF]
+FF = STATE_CODES[StateNames.FF]
+MF = STATE_CODES[StateNames.MF]
+SF = STATE_CODES[StateNames.SF]
+DEAD = STATE_CODES[StateNames.DEAD]
+
+ADULT_CODES = np.array([STATE_CODES[state] for state in ADULT_STATES])
+
+# InsectConfig sampler drawing the duration set by each state's on_enter
+DURATION_SAMPLERS = {
+    EGG: 'egg_duration',
+    LARVA: 'larva_duration',
+    PUPA: 'pupa_duration',
+    WM: 'wild_male_lifespan',
+    SM: 'sterile_male_lifespan',
+    YF: 'female_first_blood_meal',
+}
+
+
+class VectorizedEngine(SimulationEngine):
+    """
+    Population stored as NumPy columns (see InsectTable) and advanced one day
+    at a time with array operations. The daily rules are those of the
+    InsectState classes; only the order in which insects of the same day see
+    each other's updates differs from ObjectEngine.
+
+    Random numbers are drawn through ``_sample``, ``_random`` and
+    ``_random_patches``, from the streams of the simulation.
+    """
+
+    TABLE = InsectTable
+
+    def __init__(self) -> None:
+        self.insects = self.TABLE()
+        self.dead_counts = np.zeros(0, dtype=np.int64)
+
+    def populate(
+            self,
+            simulation: 'Simulation',
+            initial_insects: 'InitialInsects'
+    ) -> None:
+        numbers_of_patches = simulation.simulation_config.numbers_of_patches
+        self.insects = self.TABLE()
+        self.dead_counts = np.zeros(numbers_of_patches, dtype=np.int64)
+
+        patches = self.owned_patches(simulation)
+        for patch, is_male, state, number in initial_insects.initial_insects_counts():
+            if patch in patches:
+                self._add(simulation, STATE_CODES[state], number, patch, is_male)
+
+        self.write_counts(
+            simulation,
+            self.patch_counts(simulation.simulation_config.numbers_of_patches),
+            self.dead_counts
+        )
+
+    def update(self, simulation: 'Simulation') -> None:
+        self._migrate(simulation)
+        simulation.profiler.tick('migration')
+        self._advance(simulation)
+
+    def owned_patches(self, simulation: 'Simulation') -> range:
+        """Patches whose insects this engine simulates."""
+        return range(simulation.simulation_config.numbers_of_patches)
+
+    def _advance(self, simulation: 'Simulation') -> None:
+        """Every daily phase following the migration."""
+        insects = self.insects
+        profiler = simulation.profiler
+
+        previous_state = insects.state.copy()
+        insects.age += 1
+        self._transition(simulation, previous_state, insects.age > insects.duration)
+        profiler.tick('aging')
+        self._mate(simulation, np.flatnonzero(previous_state == FF))
+        profiler.tick('mating')
+        self._reproduce(simulation)
+        profiler.tick('reproduction')
+        self._release(simulation)
+        profiler.tick('release')
+
+        dead = insects.state == DEAD
+        self.dead_counts += np.bincount(
+            insects.patch[dead], minlength=len(self.dead_counts)
+        )
+        profiler.count('killed', np.count_nonzero(dead))
+        insects.compact(~dead)
+
+        self.write_counts(
+            simulation,
+            self.patch_counts(simulation.simulation_config.numbers_of_patches),
+            self.dead_counts
+        )
+        profiler.tick('bookkeeping')
+
+    def patch_counts(self, numbers_of_patches: int) -> np.ndarray:
+        """
+        :return: (numbers_of_patches, len(StateNames)) array of living insects
+        """
+        insects = self.insects
+        return np.bincount(
+            insects.patch.astype(np.int64) * len(StateNames) + insects.state,
+            minlength=numbers_of_patches * len(StateNames)
+        ).reshape(numbers_of_patches, len(StateNames))
+
+    def _migrate(self, simulation: 'Simulation') -> None:
+        insects = self.insects
+        adults = np.flatnonzero(np.isin(insects.state, ADULT_CODES))
+        if not adults.size:
+            return
+
+        insects.patch[adults] = self._random_patches(simulation, adults)
+
+    def _transition(
+            self,
+            simulation: 'Simulation',
+            previous_state: np.ndarray,
+            due: np.ndarray
+    ) -> None:
+        insects = self.insects
+
+        def due_rows(state: int) -> np.ndarray:
+            return np.flatnonzero(due & (previous_state == state))
+
+        for state, next_state, survive in (
+                (EGG, LARVA, 'egg_survive'),
+                (LARVA, PUPA, 'larva_survive'),
+        ):
+            rows = due_rows(state)
+            alive = self._sample(simulation, survive, rows).astype(bool)
+            self._enter(simulation, rows[alive], next_state)
+            self._enter(simulation, rows[~alive], DEAD)
+
+        rows = due_rows(PUPA)
+        alive = self._sample(simulation, 'pupa_survive', rows).astype(bool)
+        # same sex mapping as PupaState.transition
+        male = insects.is_male[rows]
+        self._enter(simulation, rows[alive & male], YF)
+        self._enter(simulation, rows[alive & ~male], WM)
+        self._enter(simulation, rows[~alive], DEAD)
+
+        for state in (WM, SM, MF, SF):
+            self._enter(simulation, due_rows(state), DEAD)
+
+        rows = due_rows(YF)
+        insects.duration[rows] -= insects.age[rows]
+        self._enter(simulation, rows, FF)
+
+        rows = due_rows(FF)
+        insects.duration[rows] -= insects.age[rows]
+        self._enter(simulation, rows, DEAD)
+
+    def _mate(self, simulation: 'Simulation', rows: np.ndarray) -> None:
+        """
+        Mating draw for the insects that were fertile females at the start of
+        the day; as in FertileFemaleState.update, it applies even when their
+        lifespan ran out on that day.
+        """
+        insects = self.insects
+        patches = insects.patch[rows]
+        mating_rates = np.asarray(simulation.simulation_config.mating_rates)
+
+        mating = self._random(simulation, 'mating', rows) < mating_rates[patches]
+        rows, patches = rows[mating], patches[mating]
+
+        counts = self.patch_counts(len(mating_rates))
+        wm_number = counts[patches, WM]
+        sm_number = counts[patches, SM]
+        competitiveness = simulation.insect_config.sterile_male_competitiveness
+        is_fertile = (
+            self._random(simulation, 'fertility', rows)
+            * (wm_number + competitiveness * sm_number)
+            < wm_number
+        )
+
+        alive = rows[insects.state[rows] == FF]
+        insects.duration[alive] -= insects.age[alive]
+
+        self._enter(simulation, rows[is_fertile], MF)
+        self._enter(simulation, rows[~is_fertile], SF)
+
+    def _reproduce(self, simulation: 'Simulation') -> None:
+        config = simulation.insect_config
+        capacities = np.asarray(simulation.simulation_config.capacities)
+        insects = self.insects
+
+        rows = np.flatnonzero(
+            (insects.state == MF)
+            & (insects.age >= insects.next_cycle)
+            & (insects.nb_cycles <= config.female_max_mating_cycles)
+        )
+        if not rows.size:
+            return
+
+        rows = rows[np.argsort(insects.patch[rows], kind='stable')]
+        patches = insects.patch[rows]
+        eggs = self.patch_counts(len(capacities))[:, EGG]
+        max_eggs = np.maximum(0, capacities - eggs)[patches]
+
+        nb_male_eggs = self._sample(simulation, 'eggs_male_count', rows)
+        nb_female_eggs = self._sample(simulation, 'eggs_female_count', rows)
+        clutch = nb_male_eggs + nb_female_eggs
+
+        # Females of a patch lay one after the other until the egg capacity is
+        # reached; the first one that does not fit lays a scaled-down clutch.
+        laid = np.floor(nb_male_eggs) + np.floor(nb_female_eggs)
+        remaining = max_eggs - _exclusive_cumsum_by_group(laid, patches)
+        k = np.clip(remaining / clutch, 0, 1)
+        k[_exclusive_cumsum_by_group(k < 1, patches) > 0] = 0
+
+        nb_male_eggs = (nb_male_eggs * k).astype(np.int64)
+        nb_female_eggs = (nb_female_eggs * k).astype(np.int64)
+
+        insects.next_cycle[rows] = (
+            insects.age[rows]
+            + self._sample(simulation, 'female_mate_next_cycle', rows)
+        )
+
+        self._lay(simulation, rows, nb_male_eggs, nb_female_eggs)
+
+    def _lay(
+            self,
+            simulation: 'Simulation',
+            rows: np.ndarray,
+            nb_male_eggs: np.ndarray,
+            nb_female_eggs: np.ndarray
+    ) -> None:
+        """Add the eggs laid by the mated females of ``rows``."""
+        patches = self.insects.patch[rows]
+        self._add(simulation, EGG, nb_male_eggs.sum(), np.repeat(patches, nb_male_eggs), True)
+        self._add(simulation, EGG, nb_female_eggs.sum(), np.repeat(patches, nb_female_eggs), False)
+
+    def _release(self, simulation: 'Simulation') -> None:
+        patches = np.asarray(self.owned_patches(simulation))
+        numbers = simulation.release_strategy.numbers_of_insects(
+            simulation.current_day, simulation.simulation_config.numbers_of_patches
+        )[patches]
+        simulation.profiler.count('released', numbers.sum())
+        self._add(simulation, SM, numbers.sum(), np.repeat(patches, numbers), True)
+
+    def _add(
+            self,
+            simulation: 'Simulation',
+            state: int,
+            number: int,
+            patch,
+            is_male,
+            **columns
+    ) -> None:
+        """:param columns: other columns of the new insects, see InsectTable.append"""
+        number = int(number)
+        if number <= 0:
+            return
+
+        simulation.profiler.count('created', number)
+        start = self.insects.size
+        self.insects.append(number, state=state, patch=patch, is_male=is_male, **columns)
+        self._on_enter(simulation, np.arange(start, start + number), state)
+
+    def _enter(self, simulation: 'Simulation', rows: np.ndarray, state: int) -> None:
+        if not rows.size:
+            return
+
+        self.insects.state[rows] = state
+        self.insects.age[rows] = 0
+        self._on_enter(simulation, rows, state)
+
+    def _on_enter(self, simulation: 'Simulation', rows: np.ndarray, state: int) -> None:
+        insects = self.insects
+
+        if state in DURATION_SAMPLERS:
+            insects.duration[rows] = self._sample(simulation, DURATION_SAMPLERS[state], rows)
+        elif state in (FF, MF):
+            insects.duration[rows] += self._sample(simulation, 'female_lifespan', rows)
+
+        if state == MF:
+            insects.next_cycle[rows] = (
+                insects.age[rows]
+                + self._sample(simulation, 'female_mate_next_cycle', rows)
+            )
+
+    def _sample(self, simulation: 'Simulation', sampler: str, rows: np.ndarray) -> np.ndarray:
+        """
+        :param sampler: InsectConfig method drawing the variates
+        :return: one variate of ``sampler`` per insect of ``rows``
+        """
+        return getattr(simulation.insect_config, sampler)(size=rows.size)
+
+    def _random(self, simulation: 'Simulation', event: str, rows: np.ndarray) -> np.ndarray:
+        """
+        :param event: what the numbers decide, for subclasses keying them
+        :return: one uniform number in [0, 1) per insect of ``rows``
+        """
+        return simulation.spatial_manager.rng.random(rows.size)
+
+    def _random_patches(self, simulation: 'Simulation', rows: np.ndarray) -> np.ndarray:
+        """:return: patch each insect of ``rows`` migrates to"""
+        return simulation.spatial_manager.random_patches(self.insects.patch[rows])
+
+
+def _exclusive_cumsum_by_group(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Cumulative sum of the preceding values of the same group (groups sorted)."""
+    exclusive = np.cumsum(values) - values
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    lengths = np.diff(np.r_[starts, len(groups)])
+    return exclusive - np.repeat(exclusive[starts], lengths)
@@ -1,7 +1,6 @@
 from abc import ABC, abstractmethod
 
 
-
 class SimulationObserver(ABC):
 
     @abstractmethod
@@ -14,4 +13,20 @@ class SimulationObserver(ABC):
 
     @abstractmethod
     def on_enter(self, simulation: 'Simulation') -> None:
-        pass
\ No newline at end of file
+        pass
+
+    def on_phase(self, simulation: 'Simulation', phase: str, seconds: float) -> None:
+        """
+        Called at the end of each day for every phase the day went through,
+        after ``update``. Simulation only times the phases when an observer
+        overrides this method.
+
+        :param phase: e.g. 'migration', 'state.EggState' or 'observer.Logger';
+            the day's counters are in ``simulation.profiler.counters``
+        :param seconds: time spent in the phase on this day
+        """
+        pass
+
+    def profiles(self) -> bool:
+        """:return: whether this observer listens to ``on_phase``"""
+        return type(self).on_phase is not SimulationObserver.on_phase
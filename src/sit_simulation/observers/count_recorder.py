@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, TYPE_CHECKING
+
+import numpy as np
+
+from sit_simulation.core.constants import StateNames
+from sit_simulation.core.simulation import Simulation
+from sit_simulation.observers.base_observer import SimulationObserver
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class CountRecorder(SimulationObserver):
+    """
+    Keeps the counts of every day in one preallocated
+    (numbers_of_day + 1, numbers_of_patches, len(StateNames)) array, day 0
+    being the initial population.
+    """
+
+    def __init__(self) -> None:
+        self.counts = np.zeros((0, 0, len(StateNames)), dtype=np.int64)
+
+    def update(self, simulation: Simulation) -> None:
+        self.counts[simulation.current_day] = simulation.spatial_manager.counts
+
+    def on_exit(self, simulation: Simulation) -> None:
+        pass
+
+    def on_enter(self, simulation: Simulation) -> None:
+        self.counts = np.zeros(
+            (
+                simulation.simulation_config.numbers_of_day + 1,
+                simulation.simulation_config.numbers_of_patches,
+                len(StateNames),
+            ),
+            dtype=np.int64
+        )
+        self.update(simulation)
+
+    def to_dataframes(self, dead: bool = False) -> List['pd.DataFrame']:
+        """One DataFrame per patch, see CsvOutput.to_dataframes."""
+        from sit_simulation.outputs.csv_output import CsvOutput
+
+        return CsvOutput.to_dataframes(self.counts, dead)
+
+    @staticmethod
+    def metadata(simulation: Simulation) -> Dict[str, Any]:
+        """Description of the run stored next to its counts."""
+        seed_sequence = simulation.random_streams.seed_sequence
+        return {
+            'numbers_of_day': simulation.simulation_config.numbers_of_day,
+            'numbers_of_patches': simulation.simulation_config.numbers_of_patches,
+            'states': [state.value for state in StateNames],
+            'engine': type(simulation.engine).__name__,
+            'entropy': str(seed_sequence.entropy),
+            'spawn_key': list(seed_sequence.spawn_key),
+        }
@@ -0,0 +1,60 @@
+import csv
+import os
+from collections import defaultdict
+from typing import Dict, List
+
+from sit_simulation.core.simulation import Simulation
+from sit_simulation.observers.base_observer import SimulationObserver
+
+
+class ProfilingObserver(SimulationObserver):
+    """
+    Table of the time spent in each phase and of the insects created,
+    released and killed, one row per day.
+    """
+
+    FILENAME = 'profile.csv'
+    COUNTERS = ('created', 'released', 'killed')
+
+    def __init__(self, output_filepath=None) -> None:
+        """
+        :param output_filepath: folder receiving profile.csv at the end of
+            the run, nothing is written by default
+        """
+        self.output_filepath = output_filepath
+        self.rows: List[Dict[str, float]] = []
+
+    def update(self, simulation: Simulation) -> None:
+        pass
+
+    def on_phase(self, simulation: Simulation, phase: str, seconds: float) -> None:
+        if not self.rows or self.rows[-1]['day'] != simulation.current_day:
+            self.rows.append({
+                'day': simulation.current_day,
+                **dict.fromkeys(self.COUNTERS, 0),
+                **simulation.profiler.counters
+            })
+        self.rows[-1][phase] = seconds
+
+    def on_exit(self, simulation: Simulation) -> None:
+        if self.output_filepath is None:
+            return
+
+        columns = list(dict.fromkeys(column for row in self.rows for column in row))
+        os.makedirs(self.output_filepath, exist_ok=True)
+        with open(os.path.join(self.output_filepath, self.FILENAME), 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=columns, restval=0)
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def on_enter(self, simulation: Simulation) -> None:
+        self.rows = []
+
+    def totals(self) -> Dict[str, float]:
+        """:return: seconds of each phase and counters summed over the days"""
+        totals = defaultdict(float)
+        for row in self.rows:
+            for column, value in row.items():
+                if column != 'day':
+                    totals[column] += value
+        return dict(totals)
@@ -0,0 +1,29 @@
+from sit_simulation.core.simulation import Simulation
+from sit_simulation.observers.base_observer import SimulationObserver
+from sit_simulation.observers.count_recorder import CountRecorder
+from sit_simulation.outputs.pdf_report import PdfReport
+
+
+class ReportObserver(SimulationObserver):
+    """
+    Renders the PDF report of the run (see PdfReport) once it is over, from
+    the counts of the recorder already observing the run.
+    """
+
+    def __init__(self, output_filepath, recorder: CountRecorder) -> None:
+        """
+        :param output_filepath: folder receiving insects_analysis.pdf
+        :param recorder: observer of the run keeping its counts, placed
+            before this one in the observers
+        """
+        self.report = PdfReport(output_filepath)
+        self.recorder = recorder
+
+    def update(self, simulation: Simulation) -> None:
+        pass
+
+    def on_exit(self, simulation: Simulation) -> None:
+        self.report.render(self.recorder.counts)
+
+    def on_enter(self, simulation: Simulation) -> None:
+        pass
@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+class OutputBackend(ABC):
+    """
+    File format of simulation results. A run is written as its
+    (numbers_of_day + 1, numbers_of_patches, len(StateNames)) counts plus a
+    metadata dictionary, in an output folder.
+
+    Formats that support it also provide a batch store: a single array of
+    shape (replicates, numbers_of_day + 1, numbers_of_patches,
+    len(StateNames)) filled one replicate at a time and read back without
+    loading it whole.
+    """
+
+    @abstractmethod
+    def write(self, path: str, counts: np.ndarray, metadata: Dict[str, Any]) -> None:
+        """Write the counts of one run in the folder ``path``."""
+        pass
+
+    @abstractmethod
+    def read(self, path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """:return: counts and metadata of the run written in ``path``"""
+        pass
+
+    def create_store(
+            self,
+            path: str,
+            shape: Tuple[int, ...],
+            metadata: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        Create the batch store of the folder ``path``.
+
+        :return: writable array of ``shape``, each replicate being assigned
+            to ``store[index]``
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no batch store")
+
+    def open_store(self, path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """:return: read-only, lazily loaded array and metadata of a batch store"""
+        raise NotImplementedError(f"{type(self).__name__} has no batch store")
@@ -0,0 +1,64 @@
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sit_simulation.core.constants import STATE_CODES, StateNames
+from sit_simulation.outputs.base_output import OutputBackend
+
+
+class CsvOutput(OutputBackend):
+    """
+    One ``patch_{i}.csv`` file per patch with a Day column and one column per
+    living state, as read by scripts/data_processing.py, and the metadata in
+    ``metadata.json``.
+    """
+
+    def write(self, path: str, counts: np.ndarray, metadata: Dict[str, Any]) -> None:
+        os.makedirs(path, exist_ok=True)
+
+        for patch, df in enumerate(self.to_dataframes(counts)):
+            df.to_csv(os.path.join(path, f"patch_{patch}.csv"), index=False)
+
+        with open(os.path.join(path, "metadata.json"), 'w') as file:
+            json.dump(metadata, file)
+
+    def read(self, path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        with open(os.path.join(path, "metadata.json")) as file:
+            metadata = json.load(file)
+
+        counts = np.zeros(
+            (
+                metadata['numbers_of_day'] + 1,
+                metadata['numbers_of_patches'],
+                len(StateNames)
+            ),
+            dtype=np.int64
+        )
+        for patch in range(metadata['numbers_of_patches']):
+            df = pd.read_csv(os.path.join(path, f"patch_{patch}.csv"))
+            for state in StateNames:
+                if state.value in df.columns:
+                    counts[:len(df), patch, STATE_CODES[state]] = df[state.value]
+
+        return counts, metadata
+
+    @staticmethod
+    def to_dataframes(counts: np.ndarray, dead: bool = False) -> List[pd.DataFrame]:
+        """
+        :param dead: keep the Dead column
+        :return: one DataFrame per patch, with a Day column and one column
+            per state
+        """
+        states = [s for s in StateNames if dead or s != StateNames.DEAD]
+        codes = [STATE_CODES[s] for s in states]
+        days = np.arange(len(counts))
+
+        dataframes = []
+        for patch in range(counts.shape[1]):
+            df = pd.DataFrame(counts[:, patch, codes], columns=[s.value for s in states])
+            df.insert(0, 'Day', days)
+            dataframes.append(df)
+        return dataframes
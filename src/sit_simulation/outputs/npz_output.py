@@ -0,0 +1,53 @@
+import json
+import os
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from sit_simulation.outputs.base_output import OutputBackend
+
+
+class NpzOutput(OutputBackend):
+    """
+    A run is one compressed ``counts.npz`` holding the counts and the
+    metadata as JSON. The batch store is an uncompressed ``counts.npy``, so
+    that it can be filled and read through a memory map, next to a
+    ``metadata.json`` file.
+    """
+
+    FILENAME = "counts.npz"
+    STORE_FILENAME = "counts.npy"
+    METADATA_FILENAME = "metadata.json"
+
+    def write(self, path: str, counts: np.ndarray, metadata: Dict[str, Any]) -> None:
+        os.makedirs(path, exist_ok=True)
+        np.savez_compressed(
+            os.path.join(path, self.FILENAME),
+            counts=counts,
+            metadata=json.dumps(metadata)
+        )
+
+    def read(self, path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        with np.load(os.path.join(path, self.FILENAME)) as data:
+            return data['counts'], json.loads(str(data['metadata']))
+
+    def create_store(
+            self,
+            path: str,
+            shape: Tuple[int, ...],
+            metadata: Dict[str, Any]
+    ) -> np.ndarray:
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, self.METADATA_FILENAME), 'w') as file:
+            json.dump(metadata, file)
+
+        return np.lib.format.open_memmap(
+            os.path.join(path, self.STORE_FILENAME),
+            mode='w+', dtype=np.int64, shape=shape
+        )
+
+    def open_store(self, path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        with open(os.path.join(path, self.METADATA_FILENAME)) as file:
+            metadata = json.load(file)
+
+        return np.load(os.path.join(path, self.STORE_FILENAME), mmap_mode='r'), metadata
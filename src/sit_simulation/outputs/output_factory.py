@@ -0,0 +1,24 @@
+from sit_simulation.core.constants import OutputFormats
+from sit_simulation.outputs.base_output import OutputBackend
+
+
+class OutputFactory:
+
+    @staticmethod
+    def create_output(output_format: OutputFormats) -> OutputBackend:
+        # backends are imported on demand, the CSV one pulling in pandas
+        match output_format:
+            case OutputFormats.CSV:
+                from sit_simulation.outputs.csv_output import CsvOutput
+                return CsvOutput()
+            case OutputFormats.NPZ:
+                from sit_simulation.outputs.npz_output import NpzOutput
+                return NpzOutput()
+            case OutputFormats.PARQUET:
+                from sit_simulation.outputs.parquet_output import ParquetOutput
+                return ParquetOutput()
+            case OutputFormats.ZARR:
+                from sit_simulation.outputs.zarr_output import ZarrOutput
+                return ZarrOutput()
+            case _:
+                raise ValueError(f"Unknown output format: {output_format}")
@@ -0,0 +1,63 @@
+import json
+import os
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from sit_simulation.core.constants import STATE_CODES, StateNames
+from sit_simulation.outputs.base_output import OutputBackend
+
+
+class ParquetOutput(OutputBackend):
+    """
+    A run is one zstd-compressed ``counts.parquet`` table with a row per
+    (day, patch) and a column per state, the metadata being stored as JSON
+    in the schema metadata. Needs the optional pyarrow package.
+    """
+
+    FILENAME = "counts.parquet"
+    METADATA_KEY = b"sit_simulation"
+
+    def write(self, path: str, counts: np.ndarray, metadata: Dict[str, Any]) -> None:
+        pa, pq = _import_pyarrow()
+
+        numbers_of_day, numbers_of_patches, _ = counts.shape
+        columns = {
+            'day': np.repeat(np.arange(numbers_of_day, dtype=np.int32), numbers_of_patches),
+            'patch': np.tile(np.arange(numbers_of_patches, dtype=np.int32), numbers_of_day),
+        }
+        for state in StateNames:
+            columns[state.value] = counts[:, :, STATE_CODES[state]].ravel()
+
+        table = pa.table(columns).replace_schema_metadata(
+            {self.METADATA_KEY: json.dumps(metadata)}
+        )
+        os.makedirs(path, exist_ok=True)
+        pq.write_table(table, os.path.join(path, self.FILENAME), compression='zstd')
+
+    def read(self, path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        _, pq = _import_pyarrow()
+
+        table = pq.read_table(os.path.join(path, self.FILENAME))
+        metadata = json.loads(table.schema.metadata[self.METADATA_KEY])
+
+        shape = (metadata['numbers_of_day'] + 1, metadata['numbers_of_patches'])
+        counts = np.zeros((*shape, len(StateNames)), dtype=np.int64)
+        for state in StateNames:
+            counts[:, :, STATE_CODES[state]] = (
+                table.column(state.value).to_numpy().reshape(shape)
+            )
+
+        return counts, metadata
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(
+            "The parquet output format needs pyarrow: pip install pyarrow"
+        ) from error
+
+    return pyarrow, pyarrow.parquet
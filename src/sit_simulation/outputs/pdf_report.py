@@ -0,0 +1,199 @@
+import os
+
+import numpy as np
+
+from sit_simulation.core.constants import OutputFormats, StateNames
+from sit_simulation.outputs.output_factory import OutputFactory
+
+
+class PdfReport:
+    """
+    PDF report of a run: the states of each patch over time and a summary
+    page. matplotlib and pandas are only imported when a report is rendered.
+    """
+
+    FILENAME = "insects_analysis.pdf"
+
+    def __init__(self, output_filepath: str) -> None:
+        """
+        :param output_filepath: folder receiving insects_analysis.pdf
+        """
+        self.insects_data = []
+        self.output_filepath = output_filepath
+
+    def render(self, counts: np.ndarray) -> None:
+        """
+        :param counts: (numbers_of_day + 1, numbers_of_patches,
+            len(StateNames)) counts of the run
+        """
+        from sit_simulation.outputs.csv_output import CsvOutput
+
+        os.makedirs(self.output_filepath, exist_ok=True)
+
+        self.insects_data = CsvOutput.to_dataframes(counts)
+        self._create_pdf_plots()
+
+    def _create_pdf_plots(self):
+        """Create PDF with subplots for each patch showing insect states over time"""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        pdf_path = os.path.join(self.output_filepath, self.FILENAME)
+
+        with PdfPages(pdf_path) as pdf:
+            # Define colors for each state using ggplot-like colors
+            colors = ['#1F77B4', '#FF7F0E', '#2CA02C', '#D62728', '#9467BD',
+                      '#8C564B', '#E377C2', '#7F7F7F', '#BCBD22', '#17BECF',
+                      '#AEC7E8', '#FFBB78', '#98DF8A', '#FF9896', '#C5B0D5']
+
+            # Calculate grid dimensions for subplots
+            n_patches = len(self.insects_data)
+            n_cols = min(3, n_patches)  # Max 3 columns
+            n_rows = (n_patches + n_cols - 1) // n_cols
+
+            # Create figure with subplots - adjust size for shared legend
+            fig, axes = plt.subplots(n_rows, n_cols, figsize=(15, 5 * n_rows))
+            fig.suptitle('Insect Population Dynamics by Patch', fontsize=16, fontweight='bold')
+
+            # Handle single subplot case
+            if n_patches == 1:
+                axes = [axes]
+            elif n_patches > 1:
+                axes = axes.flatten()
+
+            # Get state names for legend
+            states = [s.value for s in StateNames if s != StateNames.DEAD]
+
+            # Plot data for each patch
+            lines = []  # To store line objects for legend
+            labels = []  # To store labels for legend
+
+            for patch_idx, df in enumerate(self.insects_data):
+                ax = axes[patch_idx]
+
+                if df.empty:
+                    ax.text(0.5, 0.5, f'Patch {patch_idx}\nNo Data',
+                            ha='center', va='center', transform=ax.transAxes,
+                            fontsize=12)
+                    ax.set_title(f'Patch {patch_idx}', fontweight='bold')
+                    continue
+
+                # Plot each state as a separate line
+                for state_idx, state in enumerate(states):
+                    if state in df.columns and state_idx < len(colors):
+                        line = ax.plot(df['Day'], df[state],
+                                       color=colors[state_idx],
+                                       linewidth=2.5,
+                                       alpha=0.8)[0]
+
+                        # Store first occurrence of each line for legend
+                        if patch_idx == 0 and state not in labels:
+                            lines.append(line)
+                            labels.append(state)
+
+                ax.set_title(f'Patch {patch_idx}', fontweight='bold', fontsize=12)
+                ax.set_xlabel('Day', fontsize=10)
+                ax.set_ylabel('Number of Insects', fontsize=10)
+                ax.grid(True, alpha=0.4)
+
+                # Set y-axis to start from 0
+                ax.set_ylim(bottom=0, top=10000)
+
+                # Improve tick labels
+                ax.tick_params(axis='both', which='major', labelsize=9)
+
+            # Hide empty subplots if any
+            for idx in range(len(self.insects_data), len(axes)):
+                axes[idx].set_visible(False)
+
+            # Create shared legend at the bottom of the figure
+            if lines and labels:
+                fig.legend(lines, labels,
+                           loc='lower center',
+                           bbox_to_anchor=(0.5, 0.02),
+                           ncol=min(4, len(labels)),
+                           fontsize=10,
+                           frameon=True,
+                           fancybox=True,
+                           shadow=True,
+                           framealpha=0.9)
+
+            # Adjust layout to make space for the legend
+            plt.tight_layout(rect=(0, 0.05, 1, 0.95))
+            pdf.savefig(fig, bbox_inches='tight')
+            plt.close()
+
+            # Create summary statistics page
+            self._create_summary_page(pdf)
+
+    def _create_summary_page(self, pdf):
+        """Create a summary page with overall statistics"""
+        import matplotlib.pyplot as plt
+
+        # Apply ggplot style for summary page too
+        plt.style.use('ggplot')
+
+        fig, ax = plt.subplots(figsize=(12, 8))
+
+        # Hide axes for text page
+        ax.axis('off')
+
+        summary_text = "Insect Population Simulation Summary\n\n"
+        summary_text += f"Total Patches: {len(self.insects_data)}\n\n"
+
+        total_days = 0
+        patches_with_data = 0
+
+        for patch_idx, df in enumerate(self.insects_data):
+            if not df.empty:
+                patches_with_data += 1
+                total_days = max(total_days, len(df))
+
+                summary_text += f"Patch {patch_idx}:\n"
+                summary_text += f"  - Simulation Days: {len(df)}\n"
+                summary_text += f"  - Date Range: Day {df['Day'].min()} to Day {df['Day'].max()}\n"
+
+                # Add max population for each state
+                states = [s.value for s in StateNames]
+                for state in states:
+                    if state in df.columns:
+                        max_pop = df[state].max()
+                        final_pop = df[state].iloc[-1] if len(df) > 0 else 0
+                        summary_text += f"  - {state}: Max={max_pop:.0f}, Final={final_pop:.0f}\n"
+                summary_text += "\n"
+
+        # Add overall summary
+        summary_text += f"\nOverall Summary:\n"
+        summary_text += f"  - Patches with data: {patches_with_data}/{len(self.insects_data)}\n"
+        if patches_with_data > 0:
+            summary_text += f"  - Maximum simulation days: {total_days}\n"
+
+        ax.text(0.05, 0.95, summary_text, transform=ax.transAxes,
+                fontfamily='monospace', fontsize=10, verticalalignment='top',
+                bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgray", alpha=0.7))
+
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close()
+
+
+def render_stored_run(
+        path: str,
+        output_format: OutputFormats,
+        output_filepath: str,
+        index: int = None
+) -> str:
+    """
+    Render the report of the run written in ``path``, or of the replicate at
+    ``index`` of the batch store in ``path``.
+
+    :return: path of the report
+    """
+    output = OutputFactory.create_output(output_format)
+    if index is None:
+        counts, _ = output.read(path)
+    else:
+        store, _ = output.open_store(path)
+        counts = np.asarray(store[index])
+
+    PdfReport(output_filepath).render(counts)
+    return os.path.join(output_filepath, PdfReport.FILENAME)
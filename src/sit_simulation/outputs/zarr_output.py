@@ -0,0 +1,67 @@
+import os
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from sit_simulation.outputs.base_output import OutputBackend
+
+
+class ZarrOutput(OutputBackend):
+    """
+    Counts in a compressed, chunked ``counts.zarr`` array whose attributes
+    hold the metadata. The batch store has one chunk per replicate, so that
+    replicates are written independently and read back by slices. Needs the
+    optional zarr package.
+    """
+
+    FILENAME = "counts.zarr"
+
+    def write(self, path: str, counts: np.ndarray, metadata: Dict[str, Any]) -> None:
+        array = self.create_array(path, counts.shape, counts.shape, metadata)
+        array[...] = counts
+
+    def read(self, path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        array, metadata = self.open_store(path)
+        return array[...], metadata
+
+    def create_store(
+            self,
+            path: str,
+            shape: Tuple[int, ...],
+            metadata: Dict[str, Any]
+    ) -> np.ndarray:
+        return self.create_array(path, shape, (1, *shape[1:]), metadata)
+
+    def open_store(self, path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        zarr = _import_zarr()
+
+        array = zarr.open_array(store=os.path.join(path, self.FILENAME), mode='r')
+        return array, dict(array.attrs)
+
+    def create_array(
+            self,
+            path: str,
+            shape: Tuple[int, ...],
+            chunks: Tuple[int, ...],
+            metadata: Dict[str, Any]
+    ):
+        zarr = _import_zarr()
+
+        os.makedirs(path, exist_ok=True)
+        array = zarr.open_array(
+            store=os.path.join(path, self.FILENAME),
+            mode='w', shape=shape, chunks=chunks, dtype=np.int64
+        )
+        array.attrs.update(metadata)
+        return array
+
+
+def _import_zarr():
+    try:
+        import zarr
+    except ImportError as error:
+        raise ImportError(
+            "The zarr output format needs zarr: pip install zarr"
+        ) from error
+
+    return zarr
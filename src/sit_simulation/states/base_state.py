@@ -1,21 +1,43 @@
 from abc import ABC, abstractmethod
 from typing import List, TYPE_CHECKING
 
-from sit_simulation.core.constants import ADULT_STATES
+from sit_simulation.core.constants import ADULT_STATES, STATE_CODES, StateNames
 
 if TYPE_CHECKING:
     from sit_simulation.agents.insect import Insect
 
 
 class InsectState(ABC):
-    """Base class for all insect states."""
+    """
+    Base class for all insect states. States hold no data of their own, so
+    each class has a single instance shared by every insect in that state:
+    ``EggState()`` always returns the same object.
+
+    Insects are not polled for the end of their state: ``on_enter`` sets
+    its duration and schedules the transition with the insect manager,
+    which performs it on the first day the insect's age exceeds it.
+    """
+
+    # set on each subclass from its class name, e.g. 'Egg' for EggState
+    state_name: StateNames
+    state_code: int
+    is_adult: bool
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.state_name = StateNames(cls.__name__.replace('State', ''))
+        cls.state_code = STATE_CODES[cls.state_name]
+        cls.is_adult = cls.state_name in ADULT_STATES
+        cls._instance = None
+
+    def __new__(cls) -> 'InsectState':
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
 
     def update(self, insect: 'Insect') -> None:
-        if self.state_name in ADULT_STATES:
-            insect.spatial_manager.update_insect_patch(insect)
-        insect.age += 1
-        if insect.age > insect.duration:
-            self.transition(insect)
+        """Daily move of an adult."""
+        insect.spatial_manager.update_insect_patch(insect)
 
     @abstractmethod
     def transition(self, insect: 'Insect') -> None:
@@ -34,7 +56,6 @@ class InsectState(ABC):
     def get_offspring(self, insect: 'Insect') -> List['Insect']:
         return []
 
-    @property
-    def state_name(self) -> str:
-        """Return the name of this state."""
-        return self.__class__.__name__.replace('State', '')
\ No newline at end of file
+    def __reduce__(self):
+        # unpickled as the shared instance of the class
+        return type(self), ()
@@ -12,3 +12,4 @@ class EggState(InsectState):
 
     def on_enter(self, insect: 'Insect') -> None:
         insect.duration = insect.config.egg_duration()
+        insect.manager.schedule_transition(insect)
@@ -6,11 +6,8 @@ from sit_simulation.states.sterile_female_state import SterileFemaleState
 
 
 class FertileFemaleState(InsectState):
-    def update(self, insect: 'Insect') -> None:
-        insect.spatial_manager.update_insect_patch(insect)
-        insect.age += 1
-        if insect.age > insect.duration:
-            self.transition(insect)
+    def mate(self, insect: 'Insect') -> None:
+        """Daily search for a mate of a female that was fertile this morning."""
         mate = insect.spatial_manager.mate_occurs(insect)
         if mate == 1:
             insect.set_state(MatedFemaleState())
@@ -23,6 +20,8 @@ class FertileFemaleState(InsectState):
     def on_enter(self, insect: 'Insect') -> None:
         """Called when entering this state."""
         insect.duration += insect.config.female_lifespan()
+        insect.manager.schedule_transition(insect)
+        insect.manager.fertile.append(insect)
 
     def on_exit(self, insect: 'Insect') -> None:
         insect.duration += - insect.age
\ No newline at end of file
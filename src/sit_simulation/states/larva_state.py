@@ -12,4 +12,5 @@ class LarvaState(InsectState):
 
     def on_enter(self, insect: 'Insect') -> None:
         """Called when entering this state."""
-        insect.duration = insect.config.larva_duration()
\ No newline at end of file
+        insect.duration = insect.config.larva_duration()
+        insect.manager.schedule_transition(insect)
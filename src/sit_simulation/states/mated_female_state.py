@@ -13,9 +13,10 @@ class MatedFemaleState(InsectState):
         """Called when entering this state."""
         insect.duration += insect.config.female_lifespan()
         insect.next_cycle = insect.age + insect.config.female_mate_next_cycle()
+        insect.manager.schedule_transition(insect)
+        insect.manager.schedule_clutch(insect)
 
     def get_offspring(self, insect: 'Insect') -> List['Insect']:
-        from sit_simulation.agents.insect import Insect
         if (insect.age >= insect.next_cycle
         and insect.nb_cycles <= insect.config.female_max_mating_cycles
         ):
@@ -24,29 +25,12 @@ class MatedFemaleState(InsectState):
             )
 
             offspring = (
-                [
-                    Insect(
-                        is_male=True,
-                        state=StateNames.EGG,
-                        patch=insect.patch,
-                        spatial_manager=insect.spatial_manager,
-                        config=insect.config
-                    )
-                    for _ in range(nb_male_eggs)
-                ]
-                + [
-                    Insect(
-                        is_male=False,
-                        state=StateNames.EGG,
-                        patch=insect.patch,
-                        spatial_manager=insect.spatial_manager,
-                        config=insect.config
-                    )
-                    for _ in range(nb_female_eggs)
-                ]
+                insect.manager.create(nb_male_eggs, True, StateNames.EGG, insect.patch)
+                + insect.manager.create(nb_female_eggs, False, StateNames.EGG, insect.patch)
             )
 
             insect.next_cycle = insect.age + insect.config.female_mate_next_cycle()
+            insect.manager.schedule_clutch(insect)
 
             return offspring
-        return []
\ No newline at end of file
+        return []
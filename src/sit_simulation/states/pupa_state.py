@@ -16,4 +16,5 @@ class PupaState(InsectState):
 
     def on_enter(self, insect: 'Insect') -> None:
         """Called when entering this state."""
-        insect.duration = insect.config.pupa_duration()
\ No newline at end of file
+        insect.duration = insect.config.pupa_duration()
+        insect.manager.schedule_transition(insect)
@@ -7,4 +7,4 @@ class SterileFemaleState(InsectState):
         insect.set_state(DeadState())
 
     def on_enter(self, insect: 'Insect') -> None:
-        return
\ No newline at end of file
+        insect.manager.schedule_transition(insect)
\ No newline at end of file
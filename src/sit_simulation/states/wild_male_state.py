@@ -9,4 +9,5 @@ class WildMaleState(InsectState):
 
     def on_enter(self, insect: 'Insect') -> None:
         """Called when entering this state."""
-        insect.duration = insect.config.wild_male_lifespan()
\ No newline at end of file
+        insect.duration = insect.config.wild_male_lifespan()
+        insect.manager.schedule_transition(insect)
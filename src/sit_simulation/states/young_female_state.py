@@ -10,6 +10,7 @@ class YoungFemaleState(InsectState):
     def on_enter(self, insect: 'Insect') -> None:
         """Called when entering this state."""
         insect.duration = insect.config.female_first_blood_meal()
+        insect.manager.schedule_transition(insect)
 
     def on_exit(self, insect: 'Insect') -> None:
         insect.duration += - insect.age
\ No newline at end of file